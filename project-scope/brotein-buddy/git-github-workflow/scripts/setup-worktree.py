@@ -11,13 +11,41 @@ IMPORTANT: Run this script with the bbud conda environment activated:
 """
 
 import argparse
+import functools
+import io
+import itertools
 import os
-import random
-import socket
+import shutil
 import subprocess
 import sys
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Absolute path to git. subprocess only takes the cheap posix_spawn route
+# when the executable has a directory component, no cwd is given and
+# close_fds is False; run_git_command arranges all three.
+GIT_EXECUTABLE = shutil.which('git') or 'git'
+
+# Environment shared by every git call, built once. GIT_OPTIONAL_LOCKS=0
+# stops read-only commands (status) from taking index.lock to write back a
+# refreshed index. Without a terminal there is nobody to answer a
+# credential prompt, so make git fail fast instead of hanging.
+GIT_ENV = {**os.environ, 'GIT_OPTIONAL_LOCKS': '0'}
+if not sys.stdin.isatty():
+    GIT_ENV['GIT_TERMINAL_PROMPT'] = '0'
+
+# .gitignore entries each worktree must have. None at the moment: the
+# symlinked items are ignored via .bare/info/exclude instead.
+GITIGNORE_REQUIRED_ENTRIES = frozenset()
+
+# .gitignore entries that must NOT be present
+GITIGNORE_FORBIDDEN_ENTRIES = frozenset({
+    '.claude',
+    '.claude/',
+})
+
 
 def parse_arguments():
     """Parse command-line arguments."""
@@ -41,6 +69,9 @@ Examples:
   # Include local changes without prompting
   ./setup-worktree.py --source-worktree main --include-changes
 
+  # Skip updating the source worktree (offline, tests/CI)
+  ./setup-worktree.py --source-worktree main --no-pull
+
 Local changes behavior:
   - Interactive mode: prompts user
   - Non-interactive (no TTY): includes changes automatically
@@ -89,28 +120,112 @@ Directory naming convention:
         help='Include local changes from source worktree without prompting'
     )
 
+    parser.add_argument(
+        '--no-pull',
+        action='store_true',
+        help='Do not fetch or pull in the source worktree before branching'
+    )
+
     return parser.parse_args()
 
 
-def run_git_command(cmd, cwd=None, check=True):
-    """Run a git command and return the result."""
+def run_git_command(cmd, cwd=None, check=True, env=None, decode=True, capture_stdout=True,
+                    passthrough=False):
+    """Run a git command and return the result.
+
+    With decode=False, stdout/stderr are left as bytes; use decode_output()
+    on them only when they are actually needed (e.g. on failure). With
+    capture_stdout=False, stdout goes to /dev/null and only stderr is kept
+    for error reporting. With passthrough=True, git writes stdout straight
+    to ours, so output that is only shown to the user never passes through
+    Python.
+    """
+    # Pass the working directory as `git -C` rather than cwd= so the spawn
+    # can use posix_spawn. Our own fds are non-inheritable (PEP 446), so
+    # skipping close_fds leaks nothing to git.
+    cmd = [GIT_EXECUTABLE] + (['-C', str(cwd)] if cwd else []) + list(cmd[1:])
+    if passthrough:
+        # Keep our buffered output ahead of git's
+        sys.stdout.flush()
+        stdout = None
+    else:
+        stdout = subprocess.PIPE if capture_stdout else subprocess.DEVNULL
     try:
         result = subprocess.run(
             cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=check
+            env=GIT_ENV if env is None else env,
+            stdout=stdout,
+            stderr=subprocess.PIPE,
+            text=decode,
+            check=check,
+            close_fds=False
         )
         return result
     except subprocess.CalledProcessError as e:
         return e
 
 
-def get_repo_root():
-    """Get the repository root directory (where .shared lives)."""
-    # Get the common git directory (works for both worktrees and regular repos)
-    result = run_git_command(['git', 'rev-parse', '--git-common-dir'])
+def decode_output(data):
+    """Decode raw git output captured with decode=False."""
+    return data.decode('utf-8', errors='replace')
+
+
+def read_git_pointer(path):
+    """Read a git pointer file (.git, commondir, gitdir) and resolve it.
+
+    Relative pointers are resolved against the directory holding the file.
+    """
+    value = path.read_text().strip()
+    if value.startswith('gitdir: '):
+        value = value[len('gitdir: '):]
+    target = Path(value)
+    if not target.is_absolute():
+        target = (path.parent / target).resolve()
+    return target
+
+
+def find_git_common_dir(start):
+    """Find the common git directory by reading .git files directly.
+
+    Walks up from start until a .git entry is found. A .git file (linked
+    worktree or bare-repo root) points at a gitdir, whose commondir file in
+    turn points at the shared repository. Returns None if the layout can't be
+    read, so callers can fall back to asking git.
+    """
+    if 'GIT_DIR' in os.environ:
+        return None
+
+    try:
+        for directory in (start, *start.parents):
+            dot_git = directory / '.git'
+            if dot_git.is_dir():
+                return dot_git
+            if dot_git.is_file():
+                git_dir = read_git_pointer(dot_git)
+                commondir_file = git_dir / 'commondir'
+                if commondir_file.is_file():
+                    return read_git_pointer(commondir_file)
+                return git_dir
+    except OSError:
+        return None
+
+    return None
+
+
+def get_git_common_dir():
+    """Get the common git directory (.bare for the BroteinBuddy layout)."""
+    return lookup_git_common_dir(Path.cwd())
+
+
+@functools.lru_cache(maxsize=8)
+def lookup_git_common_dir(cwd):
+    """Resolve the common git directory for cwd (cached per directory)."""
+    git_common_dir = find_git_common_dir(cwd)
+    if git_common_dir is not None:
+        return git_common_dir
+
+    # Fallback: ask git (handles GIT_DIR and layouts we don't parse)
+    result = run_git_command(['git', 'rev-parse', '--git-common-dir'], cwd=cwd)
     if result.returncode != 0:
         print("Error: Not in a git repository")
         sys.exit(1)
@@ -119,46 +234,147 @@ def get_repo_root():
 
     # If it's a relative path, resolve it
     if not git_common_dir.is_absolute():
-        git_common_dir = (Path.cwd() / git_common_dir).resolve()
+        git_common_dir = (cwd / git_common_dir).resolve()
 
-    # The repo root is the parent of .git (or the common dir itself for _root)
-    if git_common_dir.name == '.git':
-        return git_common_dir.parent
-    else:
-        # For worktrees, git-common-dir points to the main .git directory
-        return git_common_dir.parent
+    return git_common_dir
 
 
-def get_worktrees():
-    """Get list of worktrees, excluding _root."""
-    result = run_git_command(['git', 'worktree', 'list', '--porcelain'])
-    if result.returncode != 0:
-        print("Error: Failed to get worktree list")
-        sys.exit(1)
+def get_repo_root():
+    """Get the repository root directory (where .shared lives)."""
+    # The repo root is the parent of the common dir (.git or .bare)
+    return get_git_common_dir().parent
+
+
+def read_head_branch(head_file):
+    """Return the branch a HEAD file points at, or None if detached."""
+    head = head_file.read_text().strip()
+    if head.startswith('ref: refs/heads/'):
+        return head[len('ref: refs/heads/'):]
+    return None
+
+
+def read_worktrees(git_common_dir):
+    """Read worktrees from <common-dir>/worktrees/*/ without spawning git.
 
+    Each linked worktree has a gitdir file (path to its .git file) and a HEAD
+    file. Returns None if the metadata can't be read.
+    """
     worktrees = []
-    current_wt = {}
-
-    for line in result.stdout.strip().split('\n'):
-        if line.startswith('worktree '):
-            current_wt['path'] = line.split(' ', 1)[1]
-        elif line.startswith('branch '):
-            current_wt['branch'] = line.split('refs/heads/', 1)[1]
-        elif line == '':
-            if current_wt and 'branch' in current_wt:
-                # Exclude bare repo (ends with .bare)
-                if not current_wt['path'].endswith('/.bare'):
-                    worktrees.append(current_wt)
-            current_wt = {}
-
-    # Handle last worktree
-    if current_wt and 'branch' in current_wt:
-        if not current_wt['path'].endswith('/.bare'):
-            worktrees.append(current_wt)
+
+    try:
+        # A non-bare repository's main worktree isn't listed under worktrees/
+        if git_common_dir.name == '.git':
+            branch = read_head_branch(git_common_dir / 'HEAD')
+            if branch:
+                worktrees.append({'path': str(git_common_dir.parent), 'branch': branch})
+
+        worktrees_dir = git_common_dir / 'worktrees'
+        if worktrees_dir.is_dir():
+            for entry in sorted(worktrees_dir.iterdir()):
+                branch = read_head_branch(entry / 'HEAD')
+                if branch:
+                    wt_path = read_git_pointer(entry / 'gitdir').parent
+                    worktrees.append({'path': str(wt_path), 'branch': branch})
+    except OSError:
+        return None
 
     return worktrees
 
 
+def iter_nul_fields(stream):
+    """Yield the NUL-terminated fields of a binary stream as they arrive."""
+    pending = b''
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        *fields, pending = (pending + chunk).split(b'\0')
+        for field in fields:
+            yield os.fsdecode(field)
+
+
+def iter_porcelain_worktrees(lines):
+    """Yield worktree records from `git worktree list --porcelain` output.
+
+    Takes lines, or the fields of the -z form. Records are terminated by an
+    empty line/field. Records without a branch (bare repo, detached HEAD)
+    are skipped.
+    """
+    record = {}
+
+    # A trailing sentinel blank line closes the final record, so there is
+    # no special case for output that doesn't end with a blank line
+    for line in itertools.chain(lines, ('',)):
+        line = line.rstrip('\n')
+        if line:
+            key, _, value = line.partition(' ')
+            record[key] = value
+            continue
+
+        branch = record.get('branch', '')
+        if branch.startswith('refs/heads/') and not record['worktree'].endswith('/.bare'):
+            yield {'path': record['worktree'], 'branch': branch[len('refs/heads/'):]}
+        record = {}
+
+
+def prompt(message):
+    """Write a prompt and read one line from stdin.
+
+    A leaner input(): one write and flush, no stderr flush. Raises EOFError
+    at end of input like input() does, so retry loops can't spin forever.
+    """
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+def get_worktrees(source_branch=None):
+    """Get list of worktrees, excluding _root.
+
+    If source_branch is given, the git fallback stops reading as soon as that
+    worktree is found (the list is then only complete up to that entry).
+    """
+    worktrees = read_worktrees(get_git_common_dir())
+    if worktrees is not None:
+        return worktrees
+
+    # Fallback: ask git, parsing records as they stream in. -z makes every
+    # field NUL-terminated, so paths containing newlines parse unambiguously.
+    # git before 2.36 rejects -z, so then ask again for the line-based form
+    for nul_terminated in (True, False):
+        worktrees = []
+        cmd = [GIT_EXECUTABLE, 'worktree', 'list', '--porcelain']
+        if nul_terminated:
+            cmd.append('-z')
+        with subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=GIT_ENV,
+            close_fds=False
+        ) as proc:
+            if nul_terminated:
+                fields = iter_nul_fields(proc.stdout)
+            else:
+                fields = (os.fsdecode(line) for line in proc.stdout)
+            for wt in iter_porcelain_worktrees(fields):
+                worktrees.append(wt)
+                if wt['branch'] == source_branch:
+                    proc.kill()
+                    return worktrees
+            stderr = proc.stderr.read()
+
+        if proc.returncode == 0:
+            return worktrees
+
+    print("Error: Failed to get worktree list")
+    print(decode_output(stderr))
+    sys.exit(1)
+
+
 def select_source_worktree(worktrees, source_worktree_name=None):
     """Select which worktree to branch from (CLI arg or interactive)."""
     # If source worktree name provided via CLI, validate and use it
@@ -197,7 +413,7 @@ def select_source_worktree(worktrees, source_worktree_name=None):
     default_msg = f" (default: {main_index})" if main_index > 0 else ""
 
     while True:
-        choice = input(f"Select source worktree{default_msg}: ").strip()
+        choice = prompt(f"Select source worktree{default_msg}: ").strip()
 
         if choice == '' and main_index > 0:
             return worktrees[main_index - 1]
@@ -212,33 +428,96 @@ def select_source_worktree(worktrees, source_worktree_name=None):
             print("Please enter a valid number")
 
 
-def pull_and_check_status(worktree_path, exclude_changes=False, include_changes=False):
-    """Pull from remote and check for conflicts or local changes."""
-    print(f"\nPulling latest changes in {worktree_path}...")
+def get_source_status(worktree_path):
+    """Get the source worktree's upstream state and local changes in one call.
+
+    `git status --porcelain --branch` starts with a `## branch...upstream`
+    header (no `...` when there is no upstream, `[gone]` when the upstream
+    branch was deleted), followed by the usual porcelain lines. Returns
+    (has_upstream, local_changes).
+    """
+    result = run_git_command(['git', 'status', '--porcelain', '--branch'], cwd=worktree_path)
+    header, _, local_changes = result.stdout.partition('\n')
+    has_upstream = '...' in header and not header.endswith('[gone]')
+    return has_upstream, local_changes
+
+
+def start_fetch(worktree_path):
+    """Start fetching the source worktree's upstream in the background.
+
+    Lets the network round-trip overlap with the interactive prompts.
+    Returns the fetch process and its stderr file.
+    """
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        [GIT_EXECUTABLE, '-C', str(worktree_path), 'fetch', '--quiet'],
+        stdout=subprocess.DEVNULL,
+        stderr=stderr_file,
+        env=GIT_ENV,
+        close_fds=False
+    )
+    return proc, stderr_file
+
+
+def pull_source_worktree(worktree_path, fetch_proc, fetch_stderr):
+    """Bring the source worktree up to date with its upstream.
+
+    Waits for the fetch started by start_fetch() (None when there is no
+    upstream), then pulls only when the upstream has commits HEAD lacks.
+    """
+    if fetch_proc is None:
+        print("No upstream branch configured, skipping pull")
+        return
 
-    # Pull from remote
-    result = run_git_command(['git', 'pull'], cwd=worktree_path, check=False)
+    with fetch_stderr:
+        if fetch_proc.wait() != 0:
+            fetch_stderr.seek(0)
+            print(f"\nError fetching from remote: {decode_output(fetch_stderr.read())}")
+            sys.exit(1)
+
+    # Count commits on each side: local-only (ahead) and upstream-only (behind)
+    result = run_git_command(
+        ['git', 'rev-list', '--left-right', '--count', 'HEAD...@{u}'],
+        cwd=worktree_path
+    )
+    ahead, behind = result.stdout.split()
+    if behind == '0':
+        print("Already up to date.")
+        return
+
+    # Nothing local to merge: fast-forward to the fetched upstream directly
+    # rather than letting git pull fetch a second time
+    if ahead == '0':
+        git_cmd = ['git', 'merge', '--ff-only', '@{u}']
+    else:
+        git_cmd = ['git', 'pull']
+    result = run_git_command(git_cmd, cwd=worktree_path, check=False, decode=False, passthrough=True)
 
     if result.returncode != 0:
-        # Check if there are merge conflicts
-        if 'CONFLICT' in result.stdout or 'CONFLICT' in result.stderr:
+        stderr = decode_output(result.stderr)
+
+        # Check if there are merge conflicts (unmerged index entries)
+        unmerged = run_git_command(['git', 'ls-files', '--unmerged'], cwd=worktree_path, check=False)
+        if unmerged.stdout.strip():
+            # git already printed the conflict details above
             print("\nError: Merge conflicts detected!")
-            print(result.stdout)
-            print(result.stderr)
+            if stderr.strip():
+                print(stderr)
             print("\nPlease resolve conflicts in the source worktree and try again.")
             sys.exit(1)
         else:
-            print(f"\nError pulling from remote: {result.stderr}")
+            print(f"\nError pulling from remote: {stderr}")
             sys.exit(1)
 
-    print(result.stdout)
 
-    # Check for uncommitted local changes
-    status_result = run_git_command(['git', 'status', '--porcelain'], cwd=worktree_path)
+def check_local_changes(local_changes, exclude_changes=False, include_changes=False):
+    """Decide whether to include the source worktree's local changes.
 
-    if status_result.stdout.strip():
+    local_changes is `git status --porcelain` output from get_source_status().
+    """
+    if local_changes.strip():
         print("\nLocal changes detected:")
-        print(status_result.stdout)
+        print(local_changes)
 
         # If --exclude-changes flag is set, automatically exclude without prompting
         if exclude_changes:
@@ -257,7 +536,7 @@ def pull_and_check_status(worktree_path, exclude_changes=False, include_changes=
 
         # Interactive mode - prompt user
         while True:
-            choice = input("\nInclude these local changes in the new worktree? (y/n): ").strip().lower()
+            choice = prompt("\nInclude these local changes in the new worktree? (y/n): ").strip().lower()
             if choice in ['y', 'yes']:
                 return True
             elif choice in ['n', 'no']:
@@ -288,7 +567,7 @@ def get_branch_details(branch_name=None, dir_name=None):
         branch = branch_name
         print(f"Branch name: {branch} (from CLI)")
     else:
-        branch = input("Branch name: ").strip()
+        branch = prompt("Branch name: ").strip()
         if not branch:
             print("Error: Branch name is required")
             sys.exit(1)
@@ -298,7 +577,7 @@ def get_branch_details(branch_name=None, dir_name=None):
         final_dir_name = dir_name
         print(f"Directory name: {final_dir_name} (from CLI)")
     else:
-        final_dir_name = input("Directory name: ").strip()
+        final_dir_name = prompt("Directory name: ").strip()
         if not final_dir_name:
             print("Error: Directory name is required")
             sys.exit(1)
@@ -306,44 +585,39 @@ def get_branch_details(branch_name=None, dir_name=None):
     return branch, final_dir_name
 
 
-def is_port_available(port):
-    """Check if a port is actually free on localhost."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        try:
-            s.bind(('localhost', port))
-            return True
-        except OSError:
-            return False
-
-
 def assign_port(branch):
     """Assign a port for the worktree's dev server.
 
     - main branch always gets 5173 (Vite default)
-    - Other worktrees get random port in 10000-60000 range
-    - Verifies port is actually available via socket check
+    - Other worktrees get a port in the 10000-59999 range derived from the
+      branch name, so the same branch always prefers the same port
+    - Verifies the port is actually available by binding to it, probing
+      upward from the preferred port on a single socket
     """
     # Special case: main always uses default Vite port
     if branch == 'main':
         return 5173
 
-    # For other worktrees: find an available random port
-    max_attempts = 10
-    for _ in range(max_attempts):
-        port = random.randint(10000, 60000)
+    # Imported here so the main-branch path never loads the socket module
+    import socket
 
-        if is_port_available(port):
-            return port
+    port_min, port_range = 10000, 50000
+    start = zlib.crc32(branch.encode('utf-8')) % port_range
 
-    # Fallback: if we can't find a random port, try sequential from 10000
-    for port in range(10000, 11000):
-        if is_port_available(port):
-            return port
+    # A failed bind leaves the socket unbound, so one socket serves every probe
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        for offset in range(1000):
+            port = port_min + (start + offset) % port_range
+            try:
+                s.bind(('localhost', port))
+                return port
+            except OSError:
+                continue
 
-    raise Exception("Could not find an available port after checking 1000+ ports")
+    raise Exception("Could not find an available port after checking 1000 ports")
 
 
-def create_env_file(wt_dir, port):
+def create_env_file(wt_dir, port, out=None):
     """Create .env.local file with port configuration for Vite and Playwright."""
     env_path = wt_dir / '.env.local'
 
@@ -355,64 +629,73 @@ VITE_PORT={port}
 BASE_URL=http://localhost:{port}
 """
 
-    with open(env_path, 'w') as f:
-        f.write(env_content)
+    # Tiny file: write it with one syscall instead of a buffered text stream
+    fd = os.open(env_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, env_content.encode('utf-8'))
+    finally:
+        os.close(fd)
 
-    print(f"  Created .env.local with port {port}")
+    print(f"  Created .env.local with port {port}", file=out)
 
 
 def create_worktree(repo_root, source_path, branch, dir_name, include_local_changes):
     """Create the new worktree."""
     wt_dir = repo_root / dir_name
 
-    # Check if worktree already exists
-    if wt_dir.exists():
+    # Check if worktree already exists (lexists: a dangling symlink still
+    # occupies the path)
+    if os.path.lexists(wt_dir):
         print(f"\nError: Worktree already exists at {dir_name}/")
         sys.exit(1)
 
-    # Create branch if needed
+    # Create the branch and its worktree in one git call. Run it in the
+    # source worktree so the new branch starts from the source's HEAD.
     if include_local_changes:
-        # Create branch from current HEAD (includes uncommitted changes)
         print(f"\nCreating branch '{branch}' from current state (with local changes)...")
-        result = run_git_command(['git', 'branch', branch], cwd=source_path, check=False)
-
-        if result.returncode != 0 and 'already exists' not in result.stderr:
-            print(f"Error creating branch: {result.stderr}")
-            sys.exit(1)
     else:
-        # Create branch from last commit
         print(f"\nCreating branch '{branch}' from last commit...")
-        result = run_git_command(['git', 'branch', branch], cwd=source_path, check=False)
-
-        if result.returncode != 0 and 'already exists' not in result.stderr:
-            print(f"Error creating branch: {result.stderr}")
-            sys.exit(1)
-
-    # Create worktree
     print(f"Creating worktree for branch: {branch}")
-    result = run_git_command(['git', 'worktree', 'add', str(wt_dir), branch], cwd=repo_root, check=False)
+    wt_path = os.path.abspath(wt_dir)
+    result = run_git_command(
+        ['git', 'worktree', 'add', '-b', branch, wt_path],
+        cwd=source_path,
+        check=False,
+        decode=False,
+        capture_stdout=False
+    )
+
+    if result.returncode != 0 and 'a branch named' in decode_output(result.stderr):
+        # Branch already exists - check it out in the new worktree instead
+        result = run_git_command(
+            ['git', 'worktree', 'add', wt_path, branch],
+            cwd=repo_root,
+            check=False,
+            decode=False,
+            capture_stdout=False
+        )
 
     if result.returncode != 0:
-        print(f"\nError: Failed to create worktree")
-        print(result.stderr)
+        print("\nError: Failed to create worktree")
+        print(decode_output(result.stderr))
         sys.exit(1)
 
     return wt_dir
 
 
-def create_symlinks(wt_dir, repo_root):
+def create_symlinks(wt_dir, repo_root, out=None):
     """Create symlinks to shared files."""
-    print("\nSymlinking shared files...")
+    print("\nSymlinking shared files...", file=out)
 
     shared_dir = repo_root / '.shared'
 
     # Verify .shared exists
     if not shared_dir.exists():
-        print("Error: .shared directory not found")
-        print("   Run init-shared.sh first")
+        print("Error: .shared directory not found", file=out)
+        print("   Run init-shared.sh first", file=out)
         sys.exit(1)
 
-    # Create symlinks to root-level files.
+    # Symlinks to create, relative to the worktree root.
     # CLAUDE.md is intentionally NOT symlinked here: it is now a tracked file
     # in the BroteinBuddy repo, populated automatically by git checkout into
     # every worktree. A symlink would shadow the tracked file.
@@ -420,32 +703,32 @@ def create_symlinks(wt_dir, repo_root):
         ('CLAUDE_CONTEXT.md', '../.shared/CLAUDE_CONTEXT.md'),
         ('.planning', '../.shared/.planning'),
         ('.scratch', '../.shared/.scratch'),
+        ('.claude/settings.local.json', '../../.shared/.claude/settings.local.json'),
+        ('.claude/skills', '../../.shared/.claude/skills'),
+        ('.claude/agents', '../../.shared/.claude/agents'),
     ]
 
-    for target, source in symlinks:
-        target_path = wt_dir / target
-        if target_path.exists() or target_path.is_symlink():
-            target_path.unlink()
-        target_path.symlink_to(source)
-
-    # Create .claude directory with symlinks
-    claude_dir = wt_dir / '.claude'
-    claude_dir.mkdir(exist_ok=True)
-
-    claude_symlinks = [
-        ('settings.local.json', '../../.shared/.claude/settings.local.json'),
-        ('skills', '../../.shared/.claude/skills'),
-        ('agents', '../../.shared/.claude/agents'),
-    ]
-
-    for target, source in claude_symlinks:
-        target_path = claude_dir / target
-        if target_path.exists() or target_path.is_symlink():
-            target_path.unlink()
-        target_path.symlink_to(source)
-
+    # Create .claude directory to hold its symlinks
+    wt_dir_s = os.fspath(wt_dir)
+    os.makedirs(os.path.join(wt_dir_s, '.claude'), exist_ok=True)
 
-def validate_and_fix_gitignore(wt_dir):
+    # Open the worktree once and create every link relative to that fd, so
+    # each link is a single symlinkat() with no path re-resolution
+    dir_fd = os.open(wt_dir_s, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for target, source in symlinks:
+            # A fresh worktree has nothing at these paths, so create the
+            # symlink directly and only replace an existing entry on collision
+            try:
+                os.symlink(source, target, dir_fd=dir_fd)
+            except FileExistsError:
+                os.unlink(target, dir_fd=dir_fd)
+                os.symlink(source, target, dir_fd=dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def validate_and_fix_gitignore(wt_dir, out=None):
     """Validate .gitignore doesn't have problematic entries.
 
     Note: Symlink entries (.planning, .scratch, .claude/*, .env.local) are
@@ -454,91 +737,112 @@ def validate_and_fix_gitignore(wt_dir):
     """
     gitignore_path = wt_dir / '.gitignore'
 
-    if not gitignore_path.exists():
-        print("\nWarning: .gitignore not found, skipping validation")
+    # Read current .gitignore (a missing file is the rare case, so just try)
+    try:
+        text = gitignore_path.read_text()
+    except FileNotFoundError:
+        print("\nWarning: .gitignore not found, skipping validation", file=out)
         return
 
-    print("\nValidating .gitignore...")
+    print("\nValidating .gitignore...", file=out)
 
-    # No required entries - symlinks are handled by .bare/info/exclude
-    required_entries = set()
-
-    # Entries that must NOT be in .gitignore
-    forbidden_entries = {
-        '.claude',
-        '.claude/',
-    }
-
-    # Read current .gitignore
-    with open(gitignore_path, 'r') as f:
-        lines = f.readlines()
+    # Fast path: nothing required and no forbidden entry can possibly be
+    # present, so skip parsing entirely
+    if not GITIGNORE_REQUIRED_ENTRIES and not any(
+        entry in text for entry in GITIGNORE_FORBIDDEN_ENTRIES
+    ):
+        print("  .gitignore is valid", file=out)
+        return
 
-    # Parse existing entries (excluding comments and empty lines)
+    # Single pass: collect existing entries, drop forbidden ones and note
+    # where the Claude Code section starts
     existing_entries = set()
-    for line in lines:
+    forbidden_found = set()
+    new_lines = []
+    anchor = None
+    for line in text.splitlines(keepends=True):
         stripped = line.strip()
         if stripped and not stripped.startswith('#'):
             existing_entries.add(stripped)
+            if stripped in GITIGNORE_FORBIDDEN_ENTRIES:
+                forbidden_found.add(stripped)
+                continue
+        new_lines.append(line)
+        if anchor is None and 'Claude Code personal settings' in line:
+            anchor = len(new_lines)
 
-    # Check what's missing and what shouldn't be there
-    missing_entries = required_entries - existing_entries
-    forbidden_found = forbidden_entries & existing_entries
+    missing_entries = GITIGNORE_REQUIRED_ENTRIES - existing_entries
 
     if not missing_entries and not forbidden_found:
-        print("  .gitignore is valid")
+        print("  .gitignore is valid", file=out)
         return
 
     # Need to fix .gitignore
-    print("  Fixing .gitignore...")
+    print("  Fixing .gitignore...", file=out)
+
+    # Missing entries go right after the Claude Code section comment
+    added = [f"{entry}\n" for entry in sorted(missing_entries)]
+    if added:
+        if anchor is None:
+            # No Claude section found, append at the end
+            new_lines.append("\n# Claude Code personal settings (symlinked in worktrees)\n")
+            new_lines.extend(added)
+        else:
+            new_lines[anchor:anchor] = added
 
-    # Remove forbidden entries
     if forbidden_found:
-        new_lines = []
-        for line in lines:
-            stripped = line.strip()
-            if stripped not in forbidden_found:
-                new_lines.append(line)
-        lines = new_lines
-        print(f"    Removed: {', '.join(forbidden_found)}")
-
-    # Add missing entries
+        print(f"    Removed: {', '.join(forbidden_found)}", file=out)
     if missing_entries:
-        # Find the Claude Code section to add entries
-        claude_section_index = None
-        for i, line in enumerate(lines):
-            if 'Claude Code personal settings' in line:
-                claude_section_index = i
-                break
-
-        if claude_section_index is not None:
-            # Add missing entries after the section comment
-            insert_index = claude_section_index + 1
-            for entry in sorted(missing_entries):
-                lines.insert(insert_index, f"{entry}\n")
-                insert_index += 1
-        else:
-            # No Claude section found, append at the end
-            lines.append("\n# Claude Code personal settings (symlinked in worktrees)\n")
-            for entry in sorted(missing_entries):
-                lines.append(f"{entry}\n")
+        print(f"    Added: {', '.join(sorted(missing_entries))}", file=out)
+
+    # Write to a temp file and swap it in, so an interrupted run can't leave
+    # a half-written .gitignore behind. Keep the original file mode, and
+    # don't leave the temp file lying around in the worktree on failure.
+    tmp_path = gitignore_path.with_name('.gitignore.tmp')
+    try:
+        tmp_path.write_text(''.join(new_lines))
+        shutil.copymode(gitignore_path, tmp_path)
+        os.replace(tmp_path, gitignore_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
-        print(f"    Added: {', '.join(sorted(missing_entries))}")
+    print("  .gitignore fixed successfully", file=out)
 
-    # Write updated .gitignore
-    with open(gitignore_path, 'w') as f:
-        f.writelines(lines)
 
-    print("  .gitignore fixed successfully")
+def start_dependency_install(wt_dir):
+    """Start installing npm dependencies in the background.
 
+    Output is discarded except for stderr, which is spooled to a temp file
+    (not a pipe, so npm can never block on a full buffer) and shown only if
+    the install fails. Returns the process and its stderr file.
+    """
+    print("\nInstalling dependencies (in background)...")
+
+    # A fresh worktree has no node_modules, so install straight from the
+    # lockfile when there is one: npm ci skips dependency resolution, and
+    # the extra flags skip registry revalidation, audit and funding checks
+    subcommand = 'ci' if (wt_dir / 'package-lock.json').exists() else 'install'
+    cmd = ['npm', subcommand, '--prefer-offline', '--no-audit', '--no-fund']
+
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        cmd,
+        cwd=wt_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=stderr_file
+    )
+    return proc, stderr_file
 
-def install_dependencies(wt_dir):
-    """Install npm dependencies."""
-    print("\nInstalling dependencies...")
-    result = subprocess.run(['npm', 'install'], cwd=wt_dir)
 
-    if result.returncode != 0:
-        print("Warning: npm install failed")
-        return False
+def finish_dependency_install(proc, stderr_file):
+    """Wait for the background npm install/ci and report failure."""
+    with stderr_file:
+        if proc.wait() != 0:
+            stderr_file.seek(0)
+            print(stderr_file.read().decode('utf-8', errors='replace'))
+            print(f"Warning: {' '.join(proc.args[:2])} failed")
+            return False
     return True
 
 
@@ -579,7 +883,7 @@ def main():
     repo_root = get_repo_root()
 
     # Get available worktrees
-    worktrees = get_worktrees()
+    worktrees = get_worktrees(args.source_worktree)
 
     if not worktrees:
         print("Error: No worktrees found (excluding _root)")
@@ -593,11 +897,31 @@ def main():
 
     print(f"\nSelected: {source_branch}")
 
-    # Pull and check for local changes (respecting --exclude-changes and --include-changes flags)
-    include_local = pull_and_check_status(source_path, args.exclude_changes, args.include_changes)
+    # One status call reports both the upstream and any local changes
+    has_upstream, local_changes = get_source_status(source_path)
 
-    # Get new branch details (CLI args or interactive)
-    branch, dir_name = get_branch_details(args.branch_name, args.dir_name)
+    # Start fetching now so the network round-trip overlaps with the prompts
+    fetch_proc, fetch_stderr = None, None
+    if has_upstream and not args.no_pull:
+        fetch_proc, fetch_stderr = start_fetch(source_path)
+
+    try:
+        # Check for local changes (respecting --exclude-changes and --include-changes flags)
+        include_local = check_local_changes(local_changes, args.exclude_changes, args.include_changes)
+
+        # Get new branch details (CLI args or interactive)
+        branch, dir_name = get_branch_details(args.branch_name, args.dir_name)
+    except BaseException:
+        if fetch_proc is not None:
+            fetch_proc.terminate()
+        raise
+
+    # Finish updating the source worktree before branching from it
+    if args.no_pull:
+        print(f"\nSkipping pull in {source_path} (--no-pull flag set)")
+    else:
+        print(f"\nPulling latest changes in {source_path}...")
+        pull_source_worktree(source_path, fetch_proc, fetch_stderr)
 
     # Assign port for this worktree
     port = assign_port(branch)
@@ -605,17 +929,37 @@ def main():
     # Create worktree
     wt_dir = create_worktree(repo_root, source_path, branch, dir_name, include_local)
 
-    # Create symlinks
-    create_symlinks(wt_dir, repo_root)
-
-    # Create .env.local with port configuration
-    create_env_file(wt_dir, port)
-
-    # Validate and fix .gitignore
-    validate_and_fix_gitignore(wt_dir)
-
-    # Install dependencies
-    install_dependencies(wt_dir)
+    # Install dependencies in the background; nothing below touches
+    # node_modules, so npm overlaps with the remaining setup
+    npm_proc, npm_stderr = start_dependency_install(wt_dir)
+
+    # Create symlinks, .env.local and validate .gitignore. These steps touch
+    # disjoint files, so run them concurrently; each step writes to its own
+    # buffer, which is replayed in order so the output reads as before.
+    steps = [
+        (create_symlinks, (wt_dir, repo_root)),
+        (create_env_file, (wt_dir, port)),
+        (validate_and_fix_gitignore, (wt_dir,)),
+    ]
+    outputs = [io.StringIO() for _ in steps]
+    with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+        futures = [
+            executor.submit(step, *step_args, out=out)
+            for (step, step_args), out in zip(steps, outputs)
+        ]
+        try:
+            for future, out in zip(futures, outputs):
+                try:
+                    future.result()
+                finally:
+                    sys.stdout.write(out.getvalue())
+        except BaseException:
+            # Setup failed; don't leave npm running behind us
+            npm_proc.terminate()
+            raise
+
+    # Wait for dependency install to finish
+    finish_dependency_install(npm_proc, npm_stderr)
 
     # Print success message
     print_success_message(dir_name, branch, port)
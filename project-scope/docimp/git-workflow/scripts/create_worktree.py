@@ -23,16 +23,19 @@ Examples:
 """
 
 import argparse
+import functools
+import importlib.util
+import io
+import os
+import shutil
 import subprocess
 import sys
-from dataclasses import dataclass
 from pathlib import Path
 from collections.abc import Callable
-from typing import NoReturn
+from typing import NamedTuple, NoReturn, TextIO
 
 
-@dataclass
-class SymlinkSpec:
+class SymlinkSpec(NamedTuple):
     """Specification for a symlink to create in the worktree.
 
     Attributes:
@@ -49,7 +52,7 @@ class SymlinkSpec:
 
 # Symlinks to create in each new worktree
 # All paths are relative to worktree root
-WORKTREE_SYMLINKS = [
+WORKTREE_SYMLINKS = (
     # Root-level shared files
     SymlinkSpec(
         link_name='CLAUDE.md',
@@ -95,7 +98,23 @@ WORKTREE_SYMLINKS = [
         description='Shared local Claude Code settings',
         required=True
     ),
-]
+)
+
+# Directories the symlinks live in, relative to worktree root, shortest
+# first. WORKTREE_SYMLINKS is fixed, so this is worked out once here
+SYMLINK_PARENT_DIRS = sorted(
+    {Path(spec.link_name).parent for spec in WORKTREE_SYMLINKS} - {Path('.')},
+    key=lambda p: len(p.parts)
+)
+
+# Companion script that installs the git hooks (lives next to this one)
+INSTALL_HOOKS_SCRIPT = Path(__file__).parent / 'install_hooks.py'
+
+# Tools run in the new worktree, looked up on PATH once here rather than on
+# every spawn. uv is required (checked before the worktree is created);
+# direnv is optional, so a bare name just fails later like any missing tool
+UV_EXECUTABLE = shutil.which('uv')
+DIRENV_EXECUTABLE = shutil.which('direnv') or 'direnv'
 
 
 class Colors:
@@ -107,24 +126,31 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Escape codes only mean something to a terminal; when output is piped or
+# captured, drop them once here instead of formatting them into every message.
+# NO_COLOR (https://no-color.org) opts out on a terminal too
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.NC = ''
+
+
 def print_error(message: str) -> None:
     """Print error message in red."""
     print(f"{Colors.RED}Error: {message}{Colors.NC}", file=sys.stderr)
 
 
-def print_info(message: str) -> None:
+def print_info(message: str, file: TextIO | None = None) -> None:
     """Print info message in blue."""
-    print(f"{Colors.BLUE}{message}{Colors.NC}")
+    print(f"{Colors.BLUE}{message}{Colors.NC}", file=file)
 
 
-def print_success(message: str) -> None:
+def print_success(message: str, file: TextIO | None = None) -> None:
     """Print success message in green."""
-    print(f"{Colors.GREEN}{message}{Colors.NC}")
+    print(f"{Colors.GREEN}{message}{Colors.NC}", file=file)
 
 
-def print_warning(message: str) -> None:
+def print_warning(message: str, file: TextIO | None = None) -> None:
     """Print warning message in yellow."""
-    print(f"{Colors.YELLOW}{message}{Colors.NC}")
+    print(f"{Colors.YELLOW}{message}{Colors.NC}", file=file)
 
 
 def exit_with_error(message: str, show_help_hint: bool = True) -> NoReturn:
@@ -162,6 +188,14 @@ def prompt_input(
         prompt_text += f" [{default}]"
     prompt_text += f": {Colors.NC}"
 
+    # Without a terminal nobody can answer; take the default rather than
+    # block on a read that never returns
+    if not sys.stdin.isatty():
+        if default:
+            print(f"{prompt_text}{default}")
+            return default
+        exit_with_error(f"{prompt} is required when stdin is not a terminal")
+
     while True:
         user_input = input(prompt_text).strip()
 
@@ -193,6 +227,10 @@ def prompt_yes_no(prompt: str, default: bool = True) -> bool:
     default_hint = "Y/n" if default else "y/N"
     prompt_text = f"{Colors.BLUE}{prompt} [{default_hint}]: {Colors.NC}"
 
+    if not sys.stdin.isatty():
+        print(f"{prompt_text}{'y' if default else 'n'}")
+        return default
+
     while True:
         user_input = input(prompt_text).strip().lower()
 
@@ -206,31 +244,51 @@ def prompt_yes_no(prompt: str, default: bool = True) -> bool:
             print_warning("Please enter 'y' or 'n'")
 
 
+@functools.cache
+def read_local_branches() -> tuple[str, ...]:
+    """Read all local branch names with one git call, cached for the run.
+
+    Every branch lookup (the interactive validators re-check on each
+    attempt, then main() checks once more) is answered from this one
+    listing instead of a git process per query.
+
+    Raises:
+        subprocess.CalledProcessError: If git fails
+    """
+    result = subprocess.run(
+        ['git', 'for-each-ref', '--format=%(refname)', 'refs/heads'],
+        capture_output=True, text=True, check=True, close_fds=False
+    )
+    return tuple(ref.removeprefix('refs/heads/') for ref in result.stdout.splitlines() if ref)
+
+
 def get_local_branches() -> list[str]:
     """Get list of local branch names."""
     try:
-        result = subprocess.run(
-            ['git', 'branch', '--format=%(refname:short)'],
-            capture_output=True, text=True, check=True
-        )
-        return [b.strip() for b in result.stdout.strip().split('\n') if b.strip()]
+        return list(read_local_branches())
     except subprocess.CalledProcessError:
         return ['main']
 
 
 def branch_exists(branch_name: str) -> bool:
     """Check if a branch already exists."""
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{branch_name}'],
-        capture_output=True
-    )
-    return result.returncode == 0
+    try:
+        return branch_name in read_local_branches()
+    except subprocess.CalledProcessError:
+        return False
+
+
+def remote_branch_exists(branch_name: str) -> bool:
+    """Check if origin has a remote-tracking branch of this name."""
+    return subprocess.call(
+        ['git', 'show-ref', '--verify', '--quiet', f'refs/remotes/origin/{branch_name}'],
+        close_fds=False
+    ) == 0
 
 
 def worktree_path_exists(worktree_name: str) -> bool:
     """Check if a worktree path already exists."""
-    worktree_path = Path('..') / worktree_name
-    return worktree_path.exists()
+    return os.path.lexists(Path('..') / worktree_name)
 
 
 def prompt_worktree_name(default: str | None = None) -> str:
@@ -339,11 +397,12 @@ def run_interactive_prompts(args) -> None:
     print()
     args.verbose = prompt_yes_no("Enable verbose output?", default=False)
 
-    # Prompt for hooks installation
-    args.install_hooks_if_missing = prompt_yes_no(
-        "Auto-install git hooks if missing?",
-        default=True
-    )
+    # Prompt for hooks installation (--yes and --no-hooks already answered it)
+    if not args.yes and not args.no_hooks:
+        args.install_hooks_if_missing = prompt_yes_no(
+            "Auto-install git hooks if missing?",
+            default=True
+        )
 
     # Show confirmation summary
     print()
@@ -355,22 +414,35 @@ def run_interactive_prompts(args) -> None:
     print(f"  Auto-install hooks: {'Yes' if args.install_hooks_if_missing else 'No'}")
     print()
 
-    if not prompt_yes_no("Proceed with these settings?", default=True):
+    if not args.yes and not prompt_yes_no("Proceed with these settings?", default=True):
         print_info("Aborted by user")
         sys.exit(0)
 
     print()
 
 
-def run_git(*args: str, cwd: Path | None = None, check: bool = True) -> subprocess.CompletedProcess:
-    """Run git command and return result."""
+def run_git(*args: str, cwd: Path | None = None, check: bool = True, capture: bool = True) -> subprocess.CompletedProcess:
+    """Run git command and return result.
+
+    Args:
+        args: Arguments to pass to git
+        cwd: Working directory to run git in
+        check: Whether to exit with an error on non-zero exit
+        capture: Whether to collect stdout; pass False for commands whose
+            output is never read. stderr is always captured for the error
+            message.
+    """
+    # Our own fds are non-inheritable (PEP 446), so skipping close_fds
+    # leaks nothing to git and saves the child a pass over every open fd
     try:
         return subprocess.run(
             ['git'] + list(args),
             cwd=cwd,
             check=check,
-            capture_output=True,
-            text=True
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False
         )
     except subprocess.CalledProcessError as e:
         exit_with_error(f"Git command failed: {e.stderr.strip()}")
@@ -383,7 +455,8 @@ def run_command(cmd: list[str], cwd: Path | None = None, check: bool = True, sho
         cmd: Command and arguments to run
         cwd: Working directory to run command in
         check: Whether to raise on non-zero exit
-        show_output: Whether to print stdout in real-time
+        show_output: Whether to print output in real-time; otherwise stdout
+            is discarded and only stderr is kept, for the error message
 
     Returns:
         CompletedProcess result
@@ -393,11 +466,15 @@ def run_command(cmd: list[str], cwd: Path | None = None, check: bool = True, sho
     """
     try:
         if show_output:
-            # Run with live output
+            # Run with live output (flush first so our own messages stay
+            # ahead of the child's when stdout is a pipe)
+            sys.stdout.flush()
             result = subprocess.run(cmd, cwd=cwd, check=check, text=True)
         else:
-            # Capture output
-            result = subprocess.run(cmd, cwd=cwd, check=check, capture_output=True, text=True)
+            # Quiet: nothing reads stdout, so don't buffer it
+            result = subprocess.run(
+                cmd, cwd=cwd, check=check, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+            )
         return result
     except subprocess.CalledProcessError as e:
         error_msg = f"Command failed: {' '.join(cmd)}"
@@ -415,8 +492,13 @@ def validate_docimp_repo() -> Path:
     Raises:
         SystemExit: If not in a git repository or can't find docimp structure
     """
+    # One directory read shows which top-level markers are present, so only
+    # those need their marker files checked
+    with os.scandir('.') as entries:
+        names = {entry.name for entry in entries}
+
     # Check for .git (can be directory in main repo or file in worktree)
-    if not Path('.git').exists():
+    if '.git' not in names:
         exit_with_error("Not in a git repository\nPlease run this script from the docimp repository or a worktree")
 
     # Try to find docimp structure in current directory or main/ subdirectory
@@ -424,7 +506,9 @@ def validate_docimp_repo() -> Path:
     main_subdir = Path('main')
 
     # Check current directory first
-    if (current / 'cli' / 'package.json').exists() or (current / 'analyzer' / 'pyproject.toml').exists():
+    if ('cli' in names and (current / 'cli' / 'package.json').exists()) or (
+        'analyzer' in names and (current / 'analyzer' / 'pyproject.toml').exists()
+    ):
         return current
 
     # Check main/ subdirectory (running from parent)
@@ -440,50 +524,73 @@ def validate_docimp_repo() -> Path:
     )
 
 
-def check_hooks_installed() -> bool:
-    """Check if git hooks are installed (non-.sample files exist)."""
-    # Use git rev-parse to find the actual git directory (handles worktrees)
+@functools.cache
+def git_common_dir() -> Path:
+    """Find the git directory shared by all worktrees, cached for the run.
+
+    In the main worktree .git is that directory. In a linked worktree .git
+    is a file pointing at the worktree's private git dir, whose 'commondir'
+    file points back at the shared one. Both are read directly; git itself
+    is only asked when the layout is something else.
+    """
+    dot_git = Path('.git')
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        gitdir_line = dot_git.read_text().strip()
+        if gitdir_line.startswith('gitdir: '):
+            gitdir = dot_git.parent / gitdir_line.removeprefix('gitdir: ')
+            return gitdir / (gitdir / 'commondir').read_text().strip()
+    except OSError:
+        pass
+
+    # Use git rev-parse to find the actual git directory
     try:
         result = subprocess.run(
             ['git', 'rev-parse', '--git-common-dir'],
-            capture_output=True, text=True, check=True
+            capture_output=True, text=True, check=True, close_fds=False
         )
-        git_common_dir = Path(result.stdout.strip())
-        hooks_dir = git_common_dir / 'hooks'
+        return Path(result.stdout.strip())
     except subprocess.CalledProcessError:
-        hooks_dir = Path('.git/hooks')
-    if not hooks_dir.exists():
-        return False
+        return dot_git
 
-    # Check for any non-.sample hook files
-    for hook_file in hooks_dir.iterdir():
-        if hook_file.is_file() and not hook_file.name.endswith('.sample'):
-            return True
+
+def check_hooks_installed() -> bool:
+    """Check if git hooks are installed (non-.sample files exist)."""
+    hooks_dir = git_common_dir() / 'hooks'
+
+    # Check for any non-.sample hook files. scandir gets the file type from
+    # the directory entry itself, so regular files cost no extra stat.
+    try:
+        with os.scandir(hooks_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.sample') and entry.is_file():
+                    return True
+    except FileNotFoundError:
+        return False
 
     return False
 
 
 def install_hooks() -> None:
-    """Call install_hooks.py to install git hooks."""
-    install_hooks_script = Path(__file__).parent / 'install_hooks.py'
+    """Run install_hooks.py to install git hooks.
 
-    if not install_hooks_script.exists():
-        exit_with_error(f"install_hooks.py not found at {install_hooks_script}")
+    The script is loaded and its main() called in this process rather than
+    started under a second interpreter.
+    """
+    if not INSTALL_HOOKS_SCRIPT.exists():
+        exit_with_error(f"install_hooks.py not found at {INSTALL_HOOKS_SCRIPT}")
 
+    spec = importlib.util.spec_from_file_location('install_hooks', INSTALL_HOOKS_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
     try:
-        result = subprocess.run(
-            [sys.executable, str(install_hooks_script)],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        # Forward stdout (success messages from install_hooks.py)
-        if result.stdout:
-            print(result.stdout, end='')
-    except subprocess.CalledProcessError as e:
-        # Show detailed error message with stderr if available
-        error_msg = f"Failed to install hooks: {e.stderr.strip()}" if e.stderr else "Failed to install hooks"
-        exit_with_error(error_msg)
+        spec.loader.exec_module(module)
+        status = module.main()
+    except SystemExit as e:
+        # install_hooks.py has already printed why
+        status = e.code
+    if status:
+        exit_with_error("Failed to install hooks")
 
 
 def prompt_install_hooks() -> None:
@@ -493,13 +600,15 @@ def prompt_install_hooks() -> None:
 
     print_warning("\nGit hooks not installed!")
     print("Hooks protect the main branch from accidental commits and checkouts.")
-    response = input("Install hooks now? [Y/n] ").strip().lower()
-
-    if response in ('', 'y', 'yes'):
+    if not sys.stdin.isatty():
+        # Don't modify .git/hooks unasked; --install-hooks-if-missing opts in
+        print_info("Skipping hook installation (no terminal to confirm)")
+        return
+    if prompt_yes_no("Install hooks now?", default=True):
         install_hooks()
 
 
-def create_symlink(target: str, link_name: Path, verbose: bool = False) -> None:
+def create_symlink(target: str, link_name: str, verbose: bool = False, dir_fd: int | None = None) -> None:
     """Create a symlink and print success message.
 
     Validates that no file exists at link location before creating symlink.
@@ -509,59 +618,89 @@ def create_symlink(target: str, link_name: Path, verbose: bool = False) -> None:
         target: Relative or absolute path to symlink target
         link_name: Path where symlink should be created
         verbose: Whether to show detailed progress messages
+        dir_fd: Open directory that link_name is relative to, instead of
+            the current working directory
 
     Raises:
         SystemExit: If file exists at link location or symlink creation fails
     """
-    # Check if link already exists
-    if link_name.exists() or link_name.is_symlink():
+    # Just try to create it; the link location is normally free, so that's
+    # the one syscall. Only when something is already there is it inspected
+    try:
+        os.symlink(target, link_name, dir_fd=dir_fd)
+    except FileExistsError:
         # If it's already a symlink to the correct target, skip
-        if link_name.is_symlink() and link_name.readlink() == Path(target):
+        try:
+            existing_target = os.readlink(link_name, dir_fd=dir_fd)
+        except OSError:
+            existing_target = None  # Not a symlink
+        if existing_target == target:
             if verbose:
-                print_info(f"  Symlink already exists: {link_name.name}")
+                print_info(f"  Symlink already exists: {os.path.basename(link_name)}")
             return
         # Otherwise, refuse to overwrite
         exit_with_error(f"File or symlink already exists at {link_name}, refusing to overwrite")
+    except OSError as e:
+        exit_with_error(f"Failed to create symlink {os.path.basename(link_name)}: {e}")
+
+    if verbose:
+        print_success(f"✓ Created symlink: {os.path.basename(link_name)}")
 
-    # Create the symlink
+
+@functools.cache
+def existing_entries(directory: str) -> frozenset[str]:
+    """List the names in a directory that exist, cached for the run.
+
+    The symlink targets sit in a couple of shared directories, so one
+    listing of each answers every target check. Entries that are
+    themselves symlinks only count if what they point to exists.
+
+    Args:
+        directory: Directory to list
+
+    Returns:
+        Names of the existing entries (empty if the directory is missing)
+    """
     try:
-        link_name.symlink_to(target)
-        if verbose:
-            print_success(f"✓ Created symlink: {link_name.name}")
-    except OSError as e:
-        exit_with_error(f"Failed to create symlink {link_name.name}: {e}")
+        with os.scandir(directory) as entries:
+            return frozenset(
+                entry.name for entry in entries
+                if not entry.is_symlink() or os.path.exists(entry.path)
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
 
 
-def validate_symlink_target(spec: SymlinkSpec, worktree_path: Path) -> bool:
+def validate_symlink_target(spec: SymlinkSpec, link_path: str) -> bool:
     """Validate that a symlink target exists.
 
     Args:
         spec: Symlink specification
-        worktree_path: Path to the worktree being created
+        link_path: Where the symlink will be created in the new worktree
 
     Returns:
-        True if target exists or should proceed anyway, False to skip
-
-    Raises:
-        SystemExit: If required target doesn't exist
+        True if target exists or should proceed anyway, False if a required
+        target is missing (the details are printed here, so that every
+        missing target is reported before the caller exits)
     """
-    # Calculate expected link location
-    link_path = worktree_path / spec.link_name
-
     # Resolve target path relative to link location
     # If link is at worktree/foo/bar and target is ../../../shared/baz,
-    # we need to resolve from worktree/foo/bar's parent directories
-    link_dir = link_path.parent
-    target_path = (link_dir / spec.target).resolve()
-
-    if target_path.exists():
+    # we need to resolve from worktree/foo/bar's parent directories.
+    # The link's parent may not exist yet, so collapse the '..' lexically,
+    # then look the target up in its directory's cached listing; resolve()
+    # would lstat every component, so it is only used to name a missing target
+    link_dir = os.path.dirname(link_path)
+    target_dir, target_name = os.path.split(os.path.normpath(os.path.join(link_dir, spec.target)))
+    if target_name in existing_entries(target_dir):
         return True
 
+    target_path = Path(link_dir, spec.target).resolve()
+
     if spec.required:
         print_error(f"Required symlink target does not exist: {target_path}")
         print_error(f"For symlink: {spec.link_name} → {spec.target}")
         print_error(f"Description: {spec.description}")
-        exit_with_error("Cannot create worktree with missing required symlink targets")
+        return False
 
     # Optional target missing - warn and skip
     print_warning(f"Optional symlink target missing: {target_path}")
@@ -583,10 +722,21 @@ def setup_python_environment(worktree_path: Path, verbose: bool = False) -> None
         print()
         print_info("Setting up Python environment...")
 
+    # With a uv lockfile, one `uv sync` creates the venv and installs the
+    # locked dependencies plus the project (editable) in a single resolve.
+    # --frozen installs exactly what's locked without re-resolving
+    if (worktree_path / 'uv.lock').exists():
+        if verbose:
+            print_info("  Syncing .venv from uv.lock...")
+        run_command([UV_EXECUTABLE, 'sync', '--frozen'], cwd=worktree_path, show_output=verbose)
+        if verbose:
+            print_success("✓ Python environment ready")
+        return
+
     # Create virtual environment
     if verbose:
         print_info("  Creating virtual environment (.venv)...")
-    run_command(['uv', 'venv'], cwd=worktree_path, show_output=verbose)
+    run_command([UV_EXECUTABLE, 'venv'], cwd=worktree_path, show_output=verbose)
 
     # Path to the venv's python executable (used to ensure uv installs to THIS venv)
     venv_python = worktree_path / '.venv' / 'bin' / 'python'
@@ -595,39 +745,46 @@ def setup_python_environment(worktree_path: Path, verbose: bool = False) -> None
     # This ensures uv installs to the worktree's venv, not main's venv
     if verbose:
         print_info("  Installing dev dependencies...")
-    run_command(['uv', 'pip', 'sync', '--python', str(venv_python), 'requirements-dev.lock'], cwd=worktree_path, show_output=verbose)
+    run_command([UV_EXECUTABLE, 'pip', 'sync', '--python', str(venv_python), 'requirements-dev.lock'], cwd=worktree_path, show_output=verbose)
 
     # Install package in editable mode with explicit --python flag
     if verbose:
         print_info("  Installing docimp-analyzer in editable mode...")
-    run_command(['uv', 'pip', 'install', '--python', str(venv_python), '-e', '.'], cwd=worktree_path, show_output=verbose)
+    run_command([UV_EXECUTABLE, 'pip', 'install', '--python', str(venv_python), '-e', '.'], cwd=worktree_path, show_output=verbose)
 
     if verbose:
         print_success("✓ Python environment ready")
 
 
-def enable_direnv(worktree_path: Path, verbose: bool = False) -> None:
+def enable_direnv(worktree_path: Path, verbose: bool = False, out: TextIO | None = None) -> None:
     """Enable direnv for the worktree.
 
+    Failure is non-critical and only reported in verbose mode.
+
     Args:
         worktree_path: Path to the worktree directory
         verbose: Whether to show detailed progress messages
-
-    Raises:
-        SystemExit: If direnv command fails
+        out: Stream for messages (default stdout), so the step can run
+            alongside others and have its output shown afterwards
     """
     if verbose:
-        print()
-        print_info("Enabling direnv...")
+        print(file=out)
+        print_info("Enabling direnv...", file=out)
 
     try:
-        run_command(['direnv', 'allow'], cwd=worktree_path, show_output=False)
+        subprocess.run(
+            [DIRENV_EXECUTABLE, 'allow'],
+            cwd=worktree_path,
+            check=True,
+            capture_output=True,
+            text=True
+        )
         if verbose:
-            print_success("✓ direnv enabled")
-    except SystemExit:
+            print_success("✓ direnv enabled", file=out)
+    except (subprocess.CalledProcessError, FileNotFoundError):
         if verbose:
-            print_warning("Failed to enable direnv - you may need to run 'direnv allow' manually")
-            print_warning("This is non-critical and won't prevent the worktree from working")
+            print_warning("Failed to enable direnv - you may need to run 'direnv allow' manually", file=out)
+            print_warning("This is non-critical and won't prevent the worktree from working", file=out)
 
 
 def main() -> int:
@@ -644,11 +801,22 @@ def main() -> int:
     )
     parser.add_argument('worktree_name', nargs='?', help='Name of the worktree directory (e.g., issue-221)')
     parser.add_argument('branch_name', nargs='?', help='Name of the git branch (e.g., issue-221-improve-styleguides)')
-    parser.add_argument(
+    hooks_group = parser.add_mutually_exclusive_group()
+    hooks_group.add_argument(
         '--install-hooks-if-missing',
         action='store_true',
         help='Automatically install git hooks if missing (no prompt)'
     )
+    hooks_group.add_argument(
+        '--no-hooks',
+        action='store_true',
+        help='Skip the git hooks check entirely (no prompt)'
+    )
+    parser.add_argument(
+        '--yes', '-y',
+        action='store_true',
+        help='Answer yes to all confirmations, never prompting (implies --install-hooks-if-missing unless --no-hooks)'
+    )
     parser.add_argument(
         '--list-symlinks',
         action='store_true',
@@ -664,6 +832,16 @@ def main() -> int:
         action='store_true',
         help='Interactive mode: prompt for all options'
     )
+    parser.add_argument(
+        '--no-fetch',
+        action='store_true',
+        help='Branch from the last fetched origin/<base-branch> without fetching (for offline use); a local-only base branch is never fetched'
+    )
+    parser.add_argument(
+        '--shell',
+        action='store_true',
+        help='When done, replace this process with $SHELL started in the new worktree'
+    )
     parser.add_argument(
         '--base-branch',
         default=None,
@@ -671,6 +849,8 @@ def main() -> int:
     )
 
     args = parser.parse_args()
+    if args.yes and not args.no_hooks:
+        args.install_hooks_if_missing = True
 
     # Handle --list-symlinks flag (no worktree needed)
     if args.list_symlinks:
@@ -691,7 +871,6 @@ def main() -> int:
     if repo_root != Path('.'):
         if args.verbose:
             print_info(f"Changing to repository root: {repo_root}")
-        import os
         os.chdir(repo_root)
 
     # Handle interactive mode
@@ -704,63 +883,125 @@ def main() -> int:
     if not args.base_branch:
         args.base_branch = 'main'
 
-    # Ensure base branch is up to date
-    if args.verbose:
-        print_info(f"Ensuring {args.base_branch} branch is up to date...")
-    run_git('checkout', args.base_branch)
-    run_git('pull')
+    # Everything that can be checked locally is checked before anything is
+    # fetched or created. The Python environment step needs uv
+    if UV_EXECUTABLE is None:
+        exit_with_error("uv not found on PATH\nInstall uv: curl -LsSf https://astral.sh/uv/install.sh | sh")
 
-    # Create worktrees directory if needed
+    # Worktrees live next to the repo root, in its parent directory (which
+    # always exists, so there's nothing to create)
     worktree_dir = Path('..')
-    if not worktree_dir.exists():
-        print_info(f"Creating worktrees directory: {worktree_dir}")
-        worktree_dir.mkdir(parents=True)
 
-    # Check if worktree already exists
+    # Check if worktree already exists; lexists is a single lstat and also
+    # catches a dangling symlink, which would make `worktree add` fail later
     worktree_path = worktree_dir / args.worktree_name
-    if worktree_path.exists():
+    if os.path.lexists(worktree_path):
         exit_with_error(f"Worktree already exists at {worktree_path}")
 
+    # git would refuse this too, but only after the fetch; catch it here
+    if not os.access(worktree_dir, os.W_OK):
+        exit_with_error(f"Cannot create worktree: {worktree_dir.resolve()} is not writable")
+
     # Check if branch already exists
-    result = run_git('show-ref', '--verify', '--quiet', f'refs/heads/{args.branch_name}', check=False)
-    if result.returncode == 0:
+    if args.branch_name == args.base_branch:
+        exit_with_error(f"Branch name '{args.branch_name}' is the base branch\nChoose a new branch name for the worktree")
+    if branch_exists(args.branch_name):
         exit_with_error(f"Branch '{args.branch_name}' already exists\nUse a different branch name or delete the existing branch first")
 
+    # Branch from the remote base rather than checking out and pulling the
+    # local one: one git call instead of two, and the main worktree is left
+    # exactly as it was. A base that only exists locally (such as an
+    # unpushed working branch) has nothing to fetch and is branched from
+    # as it is. The fetch runs in the background while the symlink targets
+    # are checked, which needs nothing from it
+    if remote_branch_exists(args.base_branch):
+        start_point = f'origin/{args.base_branch}'
+    elif branch_exists(args.base_branch):
+        start_point = args.base_branch
+    else:
+        exit_with_error(f"Base branch '{args.base_branch}' not found locally or on origin")
+    fetch = None
+    if not args.no_fetch and start_point != args.base_branch:
+        if args.verbose:
+            print_info(f"Fetching latest {args.base_branch}...")
+        fetch = subprocess.Popen(
+            ['git', 'fetch', 'origin', args.base_branch],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            close_fds=False
+        )
+
+    # Each link's location, as plain strings since these only ever go to
+    # os-level calls
+    links = [(spec, os.path.join(worktree_path, spec.link_name)) for spec in WORKTREE_SYMLINKS]
+
+    # Pre-validate all required targets exist. Target paths are worked out
+    # lexically, so the worktree doesn't need to exist yet, and a missing
+    # target stops the run before there's a worktree to clean up
+    try:
+        missing = [spec for spec, link_path in links if not validate_symlink_target(spec, link_path)]
+        if missing:
+            exit_with_error("Cannot create worktree with missing required symlink targets")
+    except BaseException:
+        # Nothing will be created, so don't wait on the network for it
+        if fetch is not None:
+            fetch.kill()
+            fetch.communicate()
+        raise
+    if fetch is not None:
+        _, fetch_stderr = fetch.communicate()
+        if fetch.returncode != 0:
+            exit_with_error(f"Git command failed: {fetch_stderr.strip()}")
+
+    # origin/<base> only supersedes the local base when it already contains
+    # it; a local base with unpushed commits is branched from as it is, so
+    # those commits aren't left out
+    if start_point != args.base_branch and branch_exists(args.base_branch):
+        is_ancestor = subprocess.call(
+            ['git', 'merge-base', '--is-ancestor', args.base_branch, start_point],
+            close_fds=False
+        ) == 0
+        if not is_ancestor:
+            if args.verbose:
+                print_info(f"Local {args.base_branch} has commits not on {start_point}; branching from it")
+            start_point = args.base_branch
+
     # Create the worktree
     if args.verbose:
         print_info(f"Creating worktree: {worktree_path}")
-    run_git('worktree', 'add', str(worktree_path), '-b', args.branch_name)
+    # --no-track: the new branch shouldn't have origin/<base> as its upstream
+    run_git('worktree', 'add', '--no-track', '-b', args.branch_name, str(worktree_path), start_point, capture=False)
 
     # Create symlinks with cleanup on failure
     try:
         if args.verbose:
             print_info("Creating symlinks to shared files...")
 
-        # Pre-validate all required targets exist
-        for spec in WORKTREE_SYMLINKS:
-            validate_symlink_target(spec, worktree_path)
-
-        # Create parent directories as needed
-        parent_dirs_created = set()
-        for spec in WORKTREE_SYMLINKS:
-            link_path = worktree_path / spec.link_name
-            parent_dir = link_path.parent
-
-            if parent_dir != worktree_path and parent_dir not in parent_dirs_created:
-                parent_dir.mkdir(parents=True, exist_ok=True)
-                parent_dirs_created.add(parent_dir)
-
-        # Create all symlinks
-        for spec in WORKTREE_SYMLINKS:
-            link_path = worktree_path / spec.link_name
-            create_symlink(spec.target, link_path, verbose=args.verbose)
+        # Create the parent directories, then all symlinks
+        for parent_dir in SYMLINK_PARENT_DIRS:
+            (worktree_path / parent_dir).mkdir(parents=True, exist_ok=True)
+
+        # Where the platform allows it, resolve every link against one open
+        # handle on the worktree directory rather than walking the full
+        # path again for each one
+        if os.symlink in os.supports_dir_fd:
+            dir_fd = os.open(worktree_path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                for spec in WORKTREE_SYMLINKS:
+                    create_symlink(spec.target, spec.link_name, verbose=args.verbose, dir_fd=dir_fd)
+            finally:
+                os.close(dir_fd)
+        else:
+            for spec, link_path in links:
+                create_symlink(spec.target, link_path, verbose=args.verbose)
 
     except SystemExit as e:
         # Cleanup on failure - remove the worktree
         print_error(f"Symlink creation failed")
         print_info("Cleaning up worktree...")
         try:
-            run_git('worktree', 'remove', str(worktree_path), '--force')
+            run_git('worktree', 'remove', str(worktree_path), '--force', capture=False)
             print_info("Worktree removed successfully")
         except Exception as cleanup_error:
             print_warning(f"Failed to clean up worktree: {cleanup_error}")
@@ -784,45 +1025,82 @@ def main() -> int:
             print(f"  ✓ {spec.link_name} → {spec.target}")
         print()
 
-    # Check/install hooks
-    if args.install_hooks_if_missing:
-        if not check_hooks_installed():
-            install_hooks()
-    else:
-        prompt_install_hooks()
-
-    # Set up Python environment
-    setup_python_environment(worktree_path, verbose=args.verbose)
+    # Set up Python environment, enabling direnv in the background meanwhile.
+    # The two touch disjoint files (.venv vs direnv's allow list), and direnv's
+    # messages are buffered and shown once both are done
+    direnv_out = io.StringIO()
+    # Imported here: it pulls in logging, which nothing else needs, and the
+    # early exits (--list-symlinks, validation errors) never get this far
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        direnv_future = executor.submit(enable_direnv, worktree_path, args.verbose, direnv_out)
+        # Without --verbose the environment setup prints nothing, so it can
+        # also run behind the hooks step (and any time spent answering its
+        # prompt). Verbose output streams live, so it waits its turn
+        venv_future = None
+        if not args.verbose:
+            venv_future = executor.submit(setup_python_environment, worktree_path)
+
+        # Check/install hooks
+        if args.no_hooks:
+            pass
+        elif args.install_hooks_if_missing:
+            if not check_hooks_installed():
+                install_hooks()
+        else:
+            prompt_install_hooks()
 
-    # Enable direnv
-    enable_direnv(worktree_path, verbose=args.verbose)
+        try:
+            if venv_future is None:
+                setup_python_environment(worktree_path, verbose=True)
+            else:
+                venv_future.result()
+            direnv_future.result()
+        finally:
+            sys.stdout.write(direnv_out.getvalue())
 
     # Print final status (concise by default, detailed with --verbose)
     print()
     if args.verbose:
-        print_success("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print_success("✓ Worktree fully configured and ready!")
-        print_success("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print()
-        print_info("Your new worktree is ready to use:")
-        print(f"  cd {worktree_path}")
-        print()
-        print_info("Everything is set up:")
-        print("  ✓ Git worktree created")
-        print("  ✓ Symlinks to shared resources")
-        print("  ✓ Python virtual environment (.venv)")
-        print("  ✓ Dev dependencies installed")
-        print("  ✓ docimp-analyzer installed (editable mode)")
-        print("  ✓ direnv enabled")
-        print()
-        print_info("To view all worktrees:")
-        print("  git worktree list")
-        print()
+        # Assembled first, then written in one go
+        green, blue, nc = Colors.GREEN, Colors.BLUE, Colors.NC
+        summary = [
+            f"{green}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{nc}",
+            f"{green}✓ Worktree fully configured and ready!{nc}",
+            f"{green}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{nc}",
+            "",
+            f"{blue}Your new worktree is ready to use:{nc}",
+            f"  cd {worktree_path}",
+            "",
+            f"{blue}Everything is set up:{nc}",
+            "  ✓ Git worktree created",
+            "  ✓ Symlinks to shared resources",
+            "  ✓ Python virtual environment (.venv)",
+            "  ✓ Dev dependencies installed",
+            "  ✓ docimp-analyzer installed (editable mode)",
+            "  ✓ direnv enabled",
+            "",
+            f"{blue}To view all worktrees:{nc}",
+            "  git worktree list",
+            "",
+        ]
+        sys.stdout.write('\n'.join(summary) + '\n')
     else:
         # Concise output optimized for token efficiency
         print_success(f"✓ Worktree ready: {worktree_path} (branch: {args.branch_name})")
         print(f"  cd {worktree_path}")
 
+    # Hand the terminal straight to a shell in the worktree; exec replaces
+    # this process instead of leaving it waiting on a child shell
+    if args.shell:
+        shell = os.environ.get('SHELL', '/bin/sh')
+        sys.stdout.flush()
+        os.chdir(worktree_path)
+        try:
+            os.execvp(shell, [shell])
+        except OSError as e:
+            exit_with_error(f"Failed to start {shell}: {e}", show_help_hint=False)
+
     return 0
 
 
@@ -7,7 +7,7 @@ It's idempotent and safe to run multiple times.
 Usage: install_hooks.py
 """
 
-import shutil
+import os
 import sys
 from pathlib import Path
 from typing import NoReturn
@@ -22,6 +22,13 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Escape codes only mean something to a terminal; when output is piped or
+# captured, drop them once here instead of formatting them into every message.
+# NO_COLOR (https://no-color.org) opts out on a terminal too
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.NC = ''
+
+
 def print_error(message: str) -> None:
     """Print error message in red."""
     print(f"{Colors.RED}Error: {message}{Colors.NC}", file=sys.stderr)
@@ -75,17 +82,25 @@ def install_hook(hook_source: Path, hooks_target_dir: Path) -> None:
     hook_name = hook_source.name
     hook_target = hooks_target_dir / hook_name
 
-    # Validate shebang exists
-    with open(hook_source, 'r') as f:
-        first_line = f.readline()
-        if not first_line.startswith('#!'):
-            print_warning(f"Warning: {hook_name} missing shebang (starts with '{first_line[:20]}')")
+    # Hooks are a few KB, so read the whole file once; the shebang check
+    # reuses the same bytes
+    content = hook_source.read_bytes()
 
-    # Copy the hook file
-    shutil.copy2(hook_source, hook_target)
-
-    # Make executable (chmod +x)
-    hook_target.chmod(0o755)
+    # Validate shebang exists
+    if not content.startswith(b'#!'):
+        first_line = content.split(b'\n', 1)[0].decode(errors='replace')
+        print_warning(f"Warning: {hook_name} missing shebang (starts with '{first_line[:20]}')")
+
+    # Write the copy and make it executable (chmod +x) through one open
+    # handle. The copy's timestamps don't matter, so there's no copystat
+    fd = os.open(hook_target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        os.write(fd, content)
+        # The mode passed to open is masked by umask and ignored for an
+        # existing file
+        os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
 
     print_success(f"✓ Installed: {hook_name}")
 
@@ -33,6 +33,15 @@ Options:
     --list-symlinks
         Show symlinks that would be created and exit
 
+    --spec NAME[:BRANCH]
+        Create several worktrees in one run (repeatable, replaces the
+        positional arguments). Each branches from --source-branch; the
+        branch name defaults to NAME
+
+    --parallel-worktrees N
+        With --spec, set up at most N worktree environments at once
+        (default: half the CPU count)
+
 Examples:
     # Basic usage (branches from main)
     create_worktree.py issue-123
@@ -46,6 +55,9 @@ Examples:
     # Skip venv creation
     create_worktree.py quick-fix --no-venv
 
+    # Several worktrees at once
+    create_worktree.py --spec issue-1 --spec issue-2:issue-2-fix-links
+
 Repository Structure:
     wtd/
     ├── .bare/          # Bare git repository
@@ -58,15 +70,21 @@ Repository Structure:
 from __future__ import annotations
 
 import argparse
+import functools
+import io
+import os
+import re
+import shutil
+import stat
 import subprocess
 import sys
-from dataclasses import dataclass
+import threading
+from collections import deque
 from pathlib import Path
-from typing import NoReturn, Optional, Union
+from typing import NamedTuple, NoReturn, Optional, TextIO, Union
 
 
-@dataclass
-class SymlinkSpec:
+class SymlinkSpec(NamedTuple):
     """Specification for a symlink to create in the worktree.
 
     Attributes:
@@ -84,7 +102,7 @@ class SymlinkSpec:
 
 # Symlinks to create in each new worktree
 # All paths are relative to worktree root
-WORKTREE_SYMLINKS = [
+WORKTREE_SYMLINKS = (
     SymlinkSpec(
         link_name=".claude",
         target="../.shared/.claude",
@@ -121,7 +139,7 @@ WORKTREE_SYMLINKS = [
         description="Claude documentation",
         required=True,
     ),
-]
+)
 
 
 class Colors:
@@ -134,24 +152,37 @@ class Colors:
     NC = "\033[0m"  # No Color
 
 
+# Escape codes only mean something to a terminal. When output is piped or
+# captured (as when an agent runs this script), drop them once here instead
+# of formatting them into every message. NO_COLOR (https://no-color.org)
+# opts out on a terminal too. Errors go to stderr, so their color depends
+# on whether that is a terminal
+_no_color = bool(os.environ.get("NO_COLOR"))
+ERROR_COLOR, ERROR_RESET = (
+    ("", "") if _no_color or not sys.stderr.isatty() else (Colors.RED, Colors.NC)
+)
+if _no_color or not sys.stdout.isatty():
+    Colors.GREEN = Colors.RED = Colors.YELLOW = Colors.BLUE = Colors.NC = ""
+
+
 def print_error(message: str) -> None:
     """Print error message in red to stderr."""
-    print(f"{Colors.RED}Error: {message}{Colors.NC}", file=sys.stderr)
+    print(f"{ERROR_COLOR}Error: {message}{ERROR_RESET}", file=sys.stderr)
 
 
-def print_info(message: str) -> None:
+def print_info(message: str, file: Optional[TextIO] = None) -> None:
     """Print informational message in blue."""
-    print(f"{Colors.BLUE}{message}{Colors.NC}")
+    print(f"{Colors.BLUE}{message}{Colors.NC}", file=file)
 
 
-def print_success(message: str) -> None:
+def print_success(message: str, file: Optional[TextIO] = None) -> None:
     """Print success message in green."""
-    print(f"{Colors.GREEN}{message}{Colors.NC}")
+    print(f"{Colors.GREEN}{message}{Colors.NC}", file=file)
 
 
-def print_warning(message: str) -> None:
+def print_warning(message: str, file: Optional[TextIO] = None) -> None:
     """Print warning message in yellow."""
-    print(f"{Colors.YELLOW}{message}{Colors.NC}")
+    print(f"{Colors.YELLOW}{message}{Colors.NC}", file=file)
 
 
 def exit_with_error(message: str) -> NoReturn:
@@ -164,6 +195,8 @@ def run_git(
     *args: str, cwd: Optional[Path] = None, check: bool = True
 ) -> subprocess.CompletedProcess[str]:
     """Run git command and return result."""
+    # Our own fds are non-inheritable (PEP 446), so skipping close_fds
+    # leaks nothing to git and saves the child a pass over every open fd
     try:
         return subprocess.run(
             ["git", *args],
@@ -171,23 +204,131 @@ def run_git(
             check=check,
             capture_output=True,
             text=True,
+            close_fds=False,
         )
     except subprocess.CalledProcessError as e:
         exit_with_error(f"Git command failed: {e.stderr.strip()}")
 
 
+def run_git_quiet(*args: str, cwd: Optional[Path] = None) -> int:
+    """Run git command for its exit status only, discarding all output."""
+    return subprocess.call(
+        ["git", *args],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=False,
+    )
+
+
+class RepoState(NamedTuple):
+    """Snapshot of the repository's branches and where they're checked out.
+
+    Attributes:
+        refs: Fully qualified names of all local and remote-tracking branches
+        worktrees: Local branch name -> worktree it's checked out in
+    """
+
+    refs: set[str]
+    worktrees: dict[str, Path]
+
+    def ref_exists(self, ref: str) -> bool:
+        """Check whether a fully qualified ref (e.g. refs/heads/main) exists."""
+        return ref in self.refs
+
+
+def gather_repo_state() -> RepoState:
+    """Read every branch and the worktree it's checked out in with one git call.
+
+    `for-each-ref` reports each branch's worktree path itself, so this one
+    call answers all the branch-existence and worktree lookups the
+    pre-flight checks make.
+    """
+    result = run_git(
+        "for-each-ref",
+        "--format=%(refname)%00%(worktreepath)",
+        "refs/heads",
+        "refs/remotes",
+    )
+
+    # The bare repo counts as the "worktree" of whatever branch its HEAD
+    # names; that's not somewhere changes can live, so leave it out
+    bare_dir = Path(".bare").resolve()
+    refs: set[str] = set()
+    worktrees: dict[str, Path] = {}
+    for line in result.stdout.splitlines():
+        ref, _, worktree = line.partition("\0")
+        refs.add(ref)
+        if worktree and ref.startswith("refs/heads/") and Path(worktree) != bare_dir:
+            worktrees[ref[len("refs/heads/"):]] = Path(worktree)
+    return RepoState(refs, worktrees)
+
+
+@functools.cache
+def find_executable(name: str) -> Optional[str]:
+    """Look an executable up on PATH, once per run.
+
+    PATH doesn't change while the script runs, and a batch run asks about
+    direnv once per worktree.
+    """
+    return shutil.which(name)
+
+
 def check_uv_available() -> bool:
-    """Check if uv is installed and available."""
-    try:
-        subprocess.run(
-            ["uv", "--version"],
-            capture_output=True,
-            check=True,
-            timeout=5,
-        )
-        return True
-    except (FileNotFoundError, subprocess.TimeoutExpired, subprocess.CalledProcessError):
-        return False
+    """Check if uv is installed and available.
+
+    A PATH lookup is enough to decide; a broken uv install still surfaces
+    as a venv setup warning when it's actually run.
+    """
+    return find_executable("uv") is not None
+
+
+def run_streaming(
+    cmd: list[str],
+    cwd: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    out: Optional[TextIO] = None,
+) -> None:
+    """Run a command, echoing its output live instead of buffering it.
+
+    stdout and stderr are merged and printed line by line to out (default
+    stdout) as they arrive.
+    Raises CalledProcessError on failure (with the last lines of output as
+    stderr, so callers can report them) and TimeoutExpired if the command
+    is killed for running past timeout.
+    """
+    tail: deque[str] = deque(maxlen=20)
+    timed_out = threading.Event()
+    with subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    ) as proc:
+
+        def kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill) if timeout else None
+        if timer:
+            timer.start()
+        try:
+            for line in proc.stdout:
+                line = line.rstrip("\n")
+                print(f"    {line}", file=out)
+                tail.append(line)
+            returncode = proc.wait()
+        finally:
+            if timer:
+                timer.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, output="\n".join(tail))
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr="\n".join(tail))
 
 
 def validate_wtd_repo() -> None:
@@ -196,79 +337,55 @@ def validate_wtd_repo() -> None:
     The WTD repository uses a bare repo structure where .bare/ contains
     the git data and .git is a symlink to .bare/.
     """
-    bare_dir = Path(".bare")
-    git_link = Path(".git")
-    shared_dir = Path(".shared")
-
-    if not bare_dir.is_dir():
+    # One directory read answers all three checks; DirEntry.is_dir() uses
+    # the file type the listing already returned (only the .git symlink
+    # needs a stat to follow it)
+    with os.scandir(".") as it:
+        entries = {entry.name: entry for entry in it}
+    bare_dir = entries.get(".bare")
+    git_link = entries.get(".git")
+    shared_dir = entries.get(".shared")
+
+    if bare_dir is None or not bare_dir.is_dir():
         exit_with_error(
             "Not in a WTD repository root\n"
             "Expected .bare/ directory (bare git repository)\n"
             "Please run this script from the wtd/ directory"
         )
 
-    if not git_link.exists():
+    if git_link is None or not os.path.exists(git_link.path):
         exit_with_error(
             ".git symlink not found\n"
             "Expected .git -> .bare symlink"
         )
 
-    if not shared_dir.is_dir():
+    if shared_dir is None or not shared_dir.is_dir():
         exit_with_error(
             ".shared/ directory not found\n"
             "Expected .shared/ with Claude configuration and planning docs"
         )
 
 
-def validate_source_branch(branch_name: str) -> tuple[bool, str]:
+def validate_source_branch(branch_name: str, repo_state: RepoState) -> tuple[bool, str]:
     """Validate that the source branch exists (local or remote).
 
     Returns:
         Tuple of (is_valid, branch_type) where branch_type is 'local' or 'remote'
     """
     # Check if it's a local branch
-    result = run_git(
-        "show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}", check=False
-    )
-    if result.returncode == 0:
+    if repo_state.ref_exists(f"refs/heads/{branch_name}"):
         return (True, "local")
 
     # Check if it's a remote branch
-    result = run_git(
-        "show-ref", "--verify", "--quiet", f"refs/remotes/{branch_name}", check=False
-    )
-    if result.returncode == 0:
+    if repo_state.ref_exists(f"refs/remotes/{branch_name}"):
         return (True, "remote")
 
     return (False, "")
 
 
-def find_worktree_for_branch(branch_name: str) -> Optional[Path]:
+def find_worktree_for_branch(branch_name: str, repo_state: RepoState) -> Optional[Path]:
     """Find the worktree path that has the specified branch checked out."""
-    result = run_git("worktree", "list", "--porcelain", check=False)
-    if result.returncode != 0:
-        return None
-
-    current_worktree = None
-    current_branch = None
-
-    for line in result.stdout.strip().split("\n"):
-        if line.startswith("worktree "):
-            current_worktree = Path(line.split(" ", 1)[1])
-        elif line.startswith("branch "):
-            current_branch = (
-                line.split("refs/heads/", 1)[1] if "refs/heads/" in line else None
-            )
-        elif line == "":
-            if current_branch == branch_name and current_worktree:
-                return current_worktree
-            current_worktree = None
-            current_branch = None
-
-    if current_branch == branch_name and current_worktree:
-        return current_worktree
-
-    return None
+    return repo_state.worktrees.get(branch_name)
 
 
 def check_local_changes(worktree_path: Path) -> dict[str, Union[bool, int, str]]:
@@ -278,39 +395,35 @@ def check_local_changes(worktree_path: Path) -> dict[str, Union[bool, int, str]]
         "uncommitted_output": "",
         "unpushed": False,
         "unpushed_count": 0,
-        "unpushed_log": "",
+        "upstream": "",
     }
 
-    # Check for uncommitted changes
-    status_result = run_git("status", "--porcelain", cwd=worktree_path, check=False)
-    if status_result.returncode == 0 and status_result.stdout.strip():
+    # One status call covers both checks: the `## branch...upstream [ahead N]`
+    # header carries the unpushed count, the remaining lines are the
+    # uncommitted changes
+    status_result = run_git(
+        "status", "--porcelain", "--branch", cwd=worktree_path, check=False
+    )
+    if status_result.returncode != 0:
+        return changes
+
+    header, _, uncommitted_output = status_result.stdout.partition("\n")
+    if uncommitted_output.strip():
         changes["uncommitted"] = True
-        changes["uncommitted_output"] = status_result.stdout
+        changes["uncommitted_output"] = uncommitted_output
 
-    # Check for unpushed commits
-    upstream_result = run_git(
-        "rev-parse", "--abbrev-ref", "@{u}", cwd=worktree_path, check=False
-    )
-    if upstream_result.returncode == 0:
-        count_result = run_git(
-            "rev-list", "--count", "@{u}..HEAD", cwd=worktree_path, check=False
-        )
-        if count_result.returncode == 0:
-            count = int(count_result.stdout.strip())
-            if count > 0:
-                changes["unpushed"] = True
-                changes["unpushed_count"] = count
-
-                log_result = run_git(
-                    "log",
-                    "@{u}..HEAD",
-                    "--oneline",
-                    "--no-decorate",
-                    cwd=worktree_path,
-                    check=False,
-                )
-                if log_result.returncode == 0:
-                    changes["unpushed_log"] = log_result.stdout.strip()
+    # The header also names the upstream, so callers never need a separate
+    # `rev-parse @{u}` to look it up
+    upstream_match = re.match(r"## \S+?\.\.\.(\S+)", header)
+    if upstream_match:
+        changes["upstream"] = upstream_match.group(1)
+
+    # Check for unpushed commits; their log is only read if the prompt
+    # actually shows it
+    ahead_match = re.search(r"\[ahead (\d+)", header)
+    if ahead_match:
+        changes["unpushed"] = True
+        changes["unpushed_count"] = int(ahead_match.group(1))
 
     return changes
 
@@ -336,34 +449,46 @@ def prompt_include_changes(
     if changes_info["unpushed"]:
         unpushed_count = int(changes_info["unpushed_count"])
         print_warning(f"Unpushed commits ({unpushed_count}):")
-        unpushed_log = str(changes_info["unpushed_log"])
-        for line in unpushed_log.split("\n")[:5]:
+        # Only the first few commits are displayed
+        log_result = run_git(
+            "log",
+            "@{u}..HEAD",
+            "--oneline",
+            "--no-decorate",
+            "-n",
+            "5",
+            cwd=worktree_path,
+            check=False,
+        )
+        unpushed_log = log_result.stdout if log_result.returncode == 0 else ""
+        for line in unpushed_log.splitlines():
             print(f"  {line}")
         if unpushed_count > 5:
             print(f"  ... and {unpushed_count - 5} more commits")
         print()
 
-    print("Include changes in new worktree?")
+    # The menu is assembled first and written in one go
+    menu = ["Include changes in new worktree?"]
     options: dict[str, str] = {}
     option_num = 1
 
     options[str(option_num)] = "none"
-    print(f"  {option_num}. None (branch from last pushed commit)")
+    menu.append(f"  {option_num}. None (branch from last pushed commit)")
     option_num += 1
 
     if changes_info["uncommitted"]:
         options[str(option_num)] = "uncommitted"
-        print(f"  {option_num}. Uncommitted only")
+        menu.append(f"  {option_num}. Uncommitted only")
         option_num += 1
 
     if changes_info["unpushed"]:
         options[str(option_num)] = "unpushed"
-        print(f"  {option_num}. Unpushed commits only")
+        menu.append(f"  {option_num}. Unpushed commits only")
         option_num += 1
 
     if changes_info["uncommitted"] and changes_info["unpushed"]:
         options[str(option_num)] = "all"
-        print(f"  {option_num}. All changes (uncommitted + unpushed)")
+        menu.append(f"  {option_num}. All changes (uncommitted + unpushed)")
         default_choice = str(option_num)
     elif changes_info["uncommitted"]:
         default_choice = "2"
@@ -372,10 +497,18 @@ def prompt_include_changes(
     else:
         default_choice = "1"
 
-    print()
+    menu.append("\n")
+    sys.stdout.write("\n".join(menu))
+    sys.stdout.flush()
 
     while True:
-        choice = input(f"Choice [default: {default_choice}]: ").strip()
+        try:
+            choice = input(f"Choice [default: {default_choice}]: ").strip()
+        except EOFError:
+            # No answer is coming (e.g. stdin is piped or closed). Leave the
+            # source worktree alone rather than move its changes unasked
+            print("none")
+            return "none"
 
         if choice == "":
             return options[default_choice]
@@ -386,30 +519,71 @@ def prompt_include_changes(
         print(f"Please enter a number between 1 and {len(options)}")
 
 
-def create_symlink(target: str, link_name: Path) -> None:
-    """Create a symlink and print success message."""
-    if link_name.exists() or link_name.is_symlink():
-        if link_name.is_symlink() and link_name.readlink() == Path(target):
+def create_symlink(
+    target: str, link_name: Path, dir_fd: Optional[int] = None
+) -> None:
+    """Create a symlink and print success message.
+
+    If dir_fd is given, link_name is resolved relative to that open
+    directory instead of the current working directory.
+    """
+    # One lstat covers every case, including a dangling symlink
+    try:
+        st = os.lstat(link_name, dir_fd=dir_fd)
+    except FileNotFoundError:
+        st = None
+
+    if st is not None:
+        if (
+            stat.S_ISLNK(st.st_mode)
+            and os.readlink(link_name, dir_fd=dir_fd) == target
+        ):
             print_info(f"  Symlink already exists: {link_name.name}")
             return
         exit_with_error(f"File or symlink already exists at {link_name}")
 
     try:
-        link_name.symlink_to(target)
+        os.symlink(target, link_name, dir_fd=dir_fd)
         print_success(f"  [ok] {link_name.name}")
     except OSError as e:
         exit_with_error(f"Failed to create symlink {link_name.name}: {e}")
 
 
+@functools.cache
+def existing_entries(directory: str) -> frozenset[str]:
+    """List the names in a directory that exist, cached for the run.
+
+    All symlink targets sit in .shared/ (or a subdirectory), so one
+    listing answers every target check. An entry that is itself a symlink
+    only counts if what it points to exists.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(
+                entry.name
+                for entry in entries
+                if not entry.is_symlink() or os.path.exists(entry.path)
+            )
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+
 def validate_symlink_target(spec: SymlinkSpec, worktree_path: Path) -> bool:
     """Validate that a symlink target exists."""
     link_path = worktree_path / spec.link_name
     link_dir = link_path.parent
-    target_path = (link_dir / spec.target).resolve()
 
-    if target_path.exists():
+    # Collapse the '..' lexically (the link's parent may not exist yet) and
+    # look the target up in its directory's cached listing; resolve() would
+    # lstat every component, so it is only used to name a missing target
+    target_dir, target_name = os.path.split(
+        os.path.normpath(os.path.join(link_dir, spec.target))
+    )
+    if target_name in existing_entries(target_dir):
         return True
 
+    target_path = (link_dir / spec.target).resolve()
+
     if spec.required:
         print_error(f"Required symlink target does not exist: {target_path}")
         print_error(f"For symlink: {spec.link_name} -> {spec.target}")
@@ -420,148 +594,381 @@ def validate_symlink_target(spec: SymlinkSpec, worktree_path: Path) -> bool:
     return False
 
 
-def create_symlinks(worktree_path: Path) -> list[SymlinkSpec]:
+def validate_symlink_targets(worktree_path: Path) -> list[SymlinkSpec]:
+    """Validate every symlink target, returning the specs to create.
+
+    Exits if a required target is missing and skips missing optional ones.
+    Only .shared/ is examined, so this can run before the worktree exists.
+    """
+    return [
+        spec
+        for spec in WORKTREE_SYMLINKS
+        if validate_symlink_target(spec, worktree_path)
+    ]
+
+
+def create_symlinks(
+    worktree_path: Path, valid_specs: Optional[list[SymlinkSpec]] = None
+) -> list[SymlinkSpec]:
     """Create all symlinks to .shared/ resources.
 
+    valid_specs, if given, are specs already checked by
+    validate_symlink_targets; otherwise the targets are validated here.
+
     Returns:
         List of SymlinkSpec that were successfully created (for summary output).
     """
     print_info("Creating symlinks to shared resources...")
 
     # Pre-validate and collect valid specs (skips optional missing targets)
-    valid_specs = []
-    for spec in WORKTREE_SYMLINKS:
-        if validate_symlink_target(spec, worktree_path):
-            valid_specs.append(spec)
-
-    # Create symlinks only for valid targets
-    for spec in valid_specs:
-        link_path = worktree_path / spec.link_name
-        create_symlink(spec.target, link_path)
+    if valid_specs is None:
+        valid_specs = validate_symlink_targets(worktree_path)
+
+    # Create symlinks only for valid targets. Where the platform allows it,
+    # resolve every link against one open handle on the worktree directory
+    # rather than walking the full path again for each one
+    dir_fd = None
+    if os.symlink in os.supports_dir_fd:
+        dir_fd = os.open(worktree_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for spec in valid_specs:
+            if dir_fd is None:
+                create_symlink(spec.target, worktree_path / spec.link_name)
+            else:
+                create_symlink(spec.target, Path(spec.link_name), dir_fd=dir_fd)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
 
     return valid_specs
 
 
-def setup_direnv(worktree_path: Path) -> None:
-    """Run direnv allow if direnv is installed and .envrc exists."""
-    envrc_path = worktree_path / ".envrc"
-    if not envrc_path.exists() and not envrc_path.is_symlink():
+def setup_direnv(worktree_path: Path, out: Optional[TextIO] = None) -> None:
+    """Run direnv allow if direnv is installed and .envrc exists.
+
+    Messages go to out (default stdout), so the step can run alongside
+    others and have its output shown afterwards.
+    """
+    # One lstat, which also sees a dangling .envrc symlink
+    if not os.path.lexists(worktree_path / ".envrc"):
         return  # No .envrc to allow
 
-    # Check if direnv is installed
-    try:
-        subprocess.run(
-            ["direnv", "version"],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        print_info("  direnv not installed, skipping direnv allow")
-        print_info("  (Install direnv for automatic Python environment activation)")
+    # Check if direnv is installed (a PATH lookup, no process)
+    direnv = find_executable("direnv")
+    if direnv is None:
+        print_info("  direnv not installed, skipping direnv allow", file=out)
+        print_info("  (Install direnv for automatic Python environment activation)", file=out)
         return
 
     # Run direnv allow from within the worktree directory
     # (direnv allow without a path argument works more reliably with symlinks)
-    print_info("  Running direnv allow...")
+    print_info("  Running direnv allow...", file=out)
     try:
         subprocess.run(
-            ["direnv", "allow"],
+            [direnv, "allow"],
             cwd=worktree_path,
             check=True,
             capture_output=True,
             text=True,
             timeout=10,
         )
-        print_success("  [ok] direnv allowed")
+        print_success("  [ok] direnv allowed", file=out)
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.strip() if e.stderr else "unknown error"
-        print_warning(f"  direnv allow failed: {error_msg}")
-        print_warning(f"  Run manually: cd {worktree_path} && direnv allow")
+        print_warning(f"  direnv allow failed: {error_msg}", file=out)
+        print_warning(f"  Run manually: cd {worktree_path} && direnv allow", file=out)
     except subprocess.TimeoutExpired:
-        print_warning("  direnv allow timed out")
-        print_warning(f"  Run manually: cd {worktree_path} && direnv allow")
+        print_warning("  direnv allow timed out", file=out)
+        print_warning(f"  Run manually: cd {worktree_path} && direnv allow", file=out)
 
 
-def setup_python_venv(worktree_path: Path) -> None:
-    """Create venv using uv and install requirements."""
-    print_info("Setting up Python environment...")
+# What a failed venv setup can raise: the RuntimeError setup_python_venv
+# raises itself, plus what running uv can (a timeout included). The
+# worktree exists by then, so these are reported as warnings
+VENV_SETUP_ERRORS = (RuntimeError, OSError, subprocess.SubprocessError)
 
-    # Read Python version from .python-version file
-    python_version_file = worktree_path / ".python-version"
+
+def setup_python_venv(worktree_path: Path, out: Optional[TextIO] = None) -> None:
+    """Create venv using uv and install requirements.
+
+    Messages and tool output go to out (default stdout).
+    """
+    print_info("Setting up Python environment...", file=out)
+
+    # One listing of the worktree root says which project files are there,
+    # rather than probing each one (and uv re-checks whatever it's given)
+    with os.scandir(worktree_path) as entries:
+        project_files = {entry.name for entry in entries}
+
+    # Read Python version from .python-version file. It's a few bytes, so
+    # read them straight off an fd; a missing or unreadable file falls
+    # through to the default
     python_version = None
-    if python_version_file.exists():
+    if ".python-version" in project_files:
         try:
-            python_version = python_version_file.read_text().strip()
-        except Exception:
+            fd = os.open(worktree_path / ".python-version", os.O_RDONLY)
+            try:
+                python_version = os.read(fd, 64).decode("ascii").strip()
+            finally:
+                os.close(fd)
+        except (OSError, UnicodeDecodeError):
             pass
 
     if not python_version:
         python_version = "3.9"  # Default for WTD project
 
-    # Ensure uv has the requested Python version
-    print_info(f"  Ensuring Python {python_version} is available...")
-    try:
-        subprocess.run(
-            ["uv", "python", "install", python_version],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-    except subprocess.CalledProcessError as e:
-        error_msg = e.stderr.strip() if e.stderr else "unknown error"
-        print_warning(f"  Could not install Python {python_version}: {error_msg}")
-        print_warning("  Continuing with default Python...")
+    # With a uv lockfile, one `uv sync` fetches the interpreter, creates the
+    # venv and installs the locked dependencies in a single process.
+    # --frozen installs exactly what's locked without re-resolving
+    if "uv.lock" in project_files:
+        print_info(f"  Syncing .venv from uv.lock (Python {python_version})...", file=out)
+        try:
+            run_streaming(
+                [
+                    "uv",
+                    "sync",
+                    "--frozen",
+                    "--python",
+                    python_version,
+                    "--python-preference",
+                    "only-managed",
+                ],
+                cwd=worktree_path,
+                timeout=450,
+                out=out,
+            )
+            print_success("  [ok] Virtual environment synced from uv.lock", file=out)
+            return
+        except subprocess.CalledProcessError as e:
+            error_msg = e.stderr.strip() if e.stderr else "unknown error"
+            print_warning(f"  uv sync failed: {error_msg}", file=out)
+            print_warning("  Falling back to uv venv + requirements.txt", file=out)
 
-    # Create venv
-    print_info("  Creating virtual environment...")
+    # Create venv. With only-managed preference, uv fetches the requested
+    # interpreter itself if it isn't installed yet, so no separate
+    # `uv python install` step is needed
+    print_info(f"  Creating virtual environment (Python {python_version})...", file=out)
     try:
-        subprocess.run(
-            ["uv", "venv", "--python", python_version],
+        run_streaming(
+            [
+                "uv",
+                "venv",
+                "--python",
+                python_version,
+                "--python-preference",
+                "only-managed",
+            ],
             cwd=worktree_path,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=30,
+            timeout=150,
+            out=out,
         )
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.strip() if e.stderr else "unknown error"
-        print_warning(f"  Failed to create venv with Python {python_version}: {error_msg}")
+        print_warning(
+            f"  Failed to create venv with Python {python_version}: {error_msg}",
+            file=out,
+        )
         # Try without specific version
         try:
-            subprocess.run(
+            run_streaming(
                 ["uv", "venv"],
                 cwd=worktree_path,
-                check=True,
-                capture_output=True,
-                text=True,
                 timeout=30,
+                out=out,
             )
         except subprocess.CalledProcessError:
             raise RuntimeError("Failed to create virtual environment")
 
+    # Report the interpreter we actually got. pyvenv.cfg already records it
+    # (uv writes version_info, stdlib venv writes version), so there's no
+    # need to start .venv/bin/python just to ask
+    try:
+        cfg = (worktree_path / ".venv" / "pyvenv.cfg").read_text()
+        actual_version = next(
+            (
+                line.split("=", 1)[1].strip()
+                for line in cfg.splitlines()
+                if line.startswith("version")
+            ),
+            python_version,
+        )
+    except OSError:
+        actual_version = python_version
+    print_success(f"  [ok] Virtual environment created (Python {actual_version})", file=out)
+
     # Install requirements
-    requirements_file = worktree_path / "requirements.txt"
-    if requirements_file.exists():
-        print_info("  Installing dependencies...")
+    if "requirements.txt" in project_files:
+        print_info("  Installing dependencies...", file=out)
         try:
-            subprocess.run(
+            run_streaming(
                 ["uv", "pip", "install", "-r", "requirements.txt"],
                 cwd=worktree_path,
-                check=True,
-                capture_output=True,
-                text=True,
                 timeout=300,
+                out=out,
             )
-            print_success("  [ok] Dependencies installed")
+            print_success("  [ok] Dependencies installed", file=out)
         except subprocess.CalledProcessError as e:
             error_msg = e.stderr.strip() if e.stderr else "unknown error"
-            print_warning(f"  Failed to install dependencies: {error_msg}")
-            print_warning("  You may need to install them manually")
+            print_warning(f"  Failed to install dependencies: {error_msg}", file=out)
+            print_warning("  You may need to install them manually", file=out)
     else:
-        print_info("  No requirements.txt found, skipping dependency installation")
+        print_info("  No requirements.txt found, skipping dependency installation", file=out)
+
+
+def create_symlinks_or_remove(
+    worktree_path: Path,
+    branch_name: str,
+    valid_specs: Optional[list[SymlinkSpec]] = None,
+) -> list[SymlinkSpec]:
+    """Create the worktree's symlinks, removing it and its new branch if that fails."""
+    try:
+        return create_symlinks(worktree_path, valid_specs)
+    except SystemExit:
+        print_error("Symlink creation failed, cleaning up...")
+        if run_git_quiet("worktree", "remove", str(worktree_path), "--force") == 0:
+            print_info("Worktree removed")
+        else:
+            print_warning(f"Please manually remove: git worktree remove {worktree_path}")
+        # The branch was made for this worktree; left behind, it would make
+        # a rerun fail with "already exists"
+        if run_git_quiet("branch", "-D", branch_name) != 0:
+            print_warning(f"Please manually delete the branch: git branch -D {branch_name}")
+        raise
+
+
+def setup_worktree_environment(worktree_path: Path, no_venv: bool) -> tuple[str, bool]:
+    """Run the venv and direnv setup for one worktree.
+
+    Output is buffered rather than printed so several worktrees can be set
+    up at once without their messages interleaving.
+
+    Returns:
+        The buffered output, and whether the setup completed without errors.
+    """
+    out = io.StringIO()
+    ok = True
+    if not no_venv:
+        # One worktree's failure mustn't stop the rest of the batch, so it's
+        # reported in its output instead
+        try:
+            setup_python_venv(worktree_path, out=out)
+        except VENV_SETUP_ERRORS as e:
+            ok = False
+            print_warning(f"Venv setup failed: {e}", file=out)
+            print_warning("You can set up the environment manually later", file=out)
+    setup_direnv(worktree_path, out)
+    return out.getvalue(), ok
+
+
+def remove_batch_worktrees(created: list[tuple[str, Path]]) -> None:
+    """Remove worktrees made earlier in a failed batch, with their branches.
+
+    The branches are new and hold nothing but the source branch's commits,
+    and deleting them lets the same --spec run be repeated once fixed.
+    """
+    for branch_name, worktree_path in reversed(created):
+        removed = (
+            run_git_quiet("worktree", "remove", str(worktree_path), "--force") == 0
+            or not worktree_path.exists()
+        )
+        if removed and run_git_quiet("branch", "-D", branch_name) == 0:
+            print_info(f"Removed {worktree_path} ({branch_name})")
+        else:
+            print_warning(
+                f"Please manually remove: git worktree remove --force {worktree_path}"
+                f" && git branch -D {branch_name}"
+            )
+
+
+def create_worktree_batch(
+    specs: list[tuple[str, str]], source_branch: str, no_venv: bool, jobs: int
+) -> int:
+    """Create several worktrees branching from source_branch in one run.
+
+    Validation reads one repo snapshot, and the git steps run one after
+    another (they contend for the same repository locks anyway). The
+    environment setup, which dominates the wall time, runs for up to jobs
+    worktrees at once; the work happens in uv/direnv child processes, so
+    threads are enough to drive it.
+    """
+    repo_root = Path.cwd()
+    worktree_paths = [repo_root / name for name, _ in specs]
+
+    repo_state = gather_repo_state()
+    print_info(f"Validating source branch '{source_branch}'...")
+    is_valid, _ = validate_source_branch(source_branch, repo_state)
+    if not is_valid:
+        exit_with_error(
+            f"Source branch '{source_branch}' does not exist\n"
+            f"Use 'git branch -a' to see available branches"
+        )
+
+    for (_, branch_name), worktree_path in zip(specs, worktree_paths):
+        if worktree_path.exists():
+            exit_with_error(f"Worktree already exists at {worktree_path}")
+        if repo_state.ref_exists(f"refs/heads/{branch_name}"):
+            exit_with_error(
+                f"Branch '{branch_name}' already exists\n"
+                f"Use a different branch name or delete the existing branch first"
+            )
+
+    # All or nothing: if one worktree can't be created, the ones made
+    # before it in this run are removed again
+    created: list[tuple[str, Path]] = []
+    try:
+        for (_, branch_name), worktree_path in zip(specs, worktree_paths):
+            print()
+            print_info(f"Creating worktree: {worktree_path}")
+            print_info(f"  Branching from: {source_branch}")
+            run_git(
+                "worktree", "add", str(worktree_path),
+                "-b", branch_name, source_branch
+            )
+            # A symlink failure cleans up this worktree itself
+            create_symlinks_or_remove(worktree_path, branch_name)
+            created.append((branch_name, worktree_path))
+    except SystemExit:
+        if created:
+            print_error(
+                f"Batch stopped at {worktree_path.name}; "
+                f"removing the {len(created)} worktree(s) created in this run"
+            )
+            remove_batch_worktrees(created)
+        raise
+
+    # Imported where used: it pulls in logging, which a --list-symlinks
+    # run or an early validation error never needs
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Results come back in spec order; each block prints once its
+    # worktree (and every one before it) is done
+    incomplete: list[Path] = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            lambda path: setup_worktree_environment(path, no_venv), worktree_paths
+        )
+        for worktree_path, (output, ok) in zip(worktree_paths, results):
+            if not ok:
+                incomplete.append(worktree_path)
+            if output:
+                print()
+                print_info(f"[{worktree_path.name}]")
+                sys.stdout.write(output)
+
+    print()
+    print_success("=" * 60)
+    print_success(f"{len(specs)} worktrees created successfully!")
+    print_success("=" * 60)
+    print()
+    for (_, branch_name), worktree_path in zip(specs, worktree_paths):
+        note = "  [environment setup incomplete, see above]" if worktree_path in incomplete else ""
+        print(f"  {worktree_path}  ({branch_name}){note}")
+    print()
+    print_info("To view all worktrees:")
+    print("  git worktree list")
+    print()
+
+    return 0
 
 
 def main() -> int:
@@ -606,6 +1013,20 @@ def main() -> int:
         action="store_true",
         help="List all symlinks that would be created and exit",
     )
+    parser.add_argument(
+        "--spec",
+        action="append",
+        metavar="NAME[:BRANCH]",
+        help="Create several worktrees in one run (repeatable; replaces the "
+        "positional arguments, each branches from --source-branch)",
+    )
+    parser.add_argument(
+        "--parallel-worktrees",
+        type=int,
+        metavar="N",
+        help="With --spec, set up at most N worktree environments at once "
+        "(default: half the CPU count)",
+    )
 
     args = parser.parse_args()
 
@@ -621,9 +1042,37 @@ def main() -> int:
             print()
         return 0
 
+    # Batch mode: every worktree branches straight from --source-branch
+    if args.spec:
+        if args.worktree_name:
+            parser.error("--spec cannot be combined with a positional worktree_name")
+        if args.include_changes not in (None, "none"):
+            parser.error("--include-changes is not supported with --spec")
+        specs = []
+        for spec in args.spec:
+            name, _, spec_branch = spec.partition(":")
+            if not name:
+                parser.error(f"invalid --spec '{spec}' (expected NAME[:BRANCH])")
+            specs.append((name, spec_branch or name))
+        names = {name for name, _ in specs}
+        branches = {spec_branch for _, spec_branch in specs}
+        if len(names) != len(specs) or len(branches) != len(specs):
+            parser.error("--spec worktree names and branches must be unique")
+        if args.parallel_worktrees is not None and args.parallel_worktrees < 1:
+            parser.error("--parallel-worktrees must be at least 1")
+        jobs = args.parallel_worktrees or max(1, (os.cpu_count() or 2) // 2)
+
+        validate_wtd_repo()
+        no_venv = args.no_venv
+        if not no_venv and not check_uv_available():
+            print_warning("uv not found - skipping venv creation")
+            print_warning("Install uv: curl -LsSf https://astral.sh/uv/install.sh | sh")
+            no_venv = True
+        return create_worktree_batch(specs, args.source_branch, no_venv, jobs)
+
     # Validate required arguments
     if not args.worktree_name:
-        parser.error("worktree_name is required (unless using --list-symlinks)")
+        parser.error("worktree_name is required (unless using --list-symlinks or --spec)")
 
     # Default branch name to worktree name
     branch_name = args.branch_name or args.worktree_name
@@ -649,9 +1098,12 @@ def main() -> int:
     else:
         include_changes_choice = None
 
+    # All ref and worktree lookups below read from one git call
+    repo_state = gather_repo_state()
+
     # Validate source branch exists
     print_info(f"Validating source branch '{args.source_branch}'...")
-    is_valid, branch_type = validate_source_branch(args.source_branch)
+    is_valid, branch_type = validate_source_branch(args.source_branch, repo_state)
     if not is_valid:
         exit_with_error(
             f"Source branch '{args.source_branch}' does not exist\n"
@@ -661,7 +1113,7 @@ def main() -> int:
     # Find worktree for source branch
     source_worktree_path = None
     if branch_type == "local":
-        source_worktree_path = find_worktree_for_branch(args.source_branch)
+        source_worktree_path = find_worktree_for_branch(args.source_branch, repo_state)
 
     # Check for changes in source worktree
     changes_info = None
@@ -690,10 +1142,7 @@ def main() -> int:
         exit_with_error(f"Worktree already exists at {worktree_path}")
 
     # Check if branch already exists
-    result = run_git(
-        "show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}", check=False
-    )
-    if result.returncode == 0:
+    if repo_state.ref_exists(f"refs/heads/{branch_name}"):
         exit_with_error(
             f"Branch '{branch_name}' already exists\n"
             f"Use a different branch name or delete the existing branch first"
@@ -703,35 +1152,23 @@ def main() -> int:
     print_info(f"Creating worktree: {worktree_path}")
     print_info(f"  Branching from: {args.source_branch}")
 
-    # Handle different include_changes scenarios
+    # Work out the `git worktree add` for each include_changes scenario
+    add_cwd = None
+    stashed = False
     if include_changes_choice == "none":
+        start_point = args.source_branch
         if source_worktree_path and changes_info and changes_info["unpushed"]:
-            upstream_result = run_git(
-                "rev-parse", "--abbrev-ref", "@{u}",
-                cwd=source_worktree_path, check=False
-            )
-            if upstream_result.returncode == 0:
-                upstream_branch = upstream_result.stdout.strip()
+            upstream_branch = str(changes_info["upstream"])
+            if upstream_branch:
                 print_info(f"  Excluding unpushed commits (from {upstream_branch})")
-                run_git(
-                    "worktree", "add", str(worktree_path),
-                    "-b", branch_name, upstream_branch
-                )
-            else:
-                run_git(
-                    "worktree", "add", str(worktree_path),
-                    "-b", branch_name, args.source_branch
-                )
-        else:
-            run_git(
-                "worktree", "add", str(worktree_path),
-                "-b", branch_name, args.source_branch
-            )
+                start_point = upstream_branch
+        add_args = ["worktree", "add", str(worktree_path), "-b", branch_name, start_point]
 
     elif include_changes_choice == "unpushed":
         print_info("  Including: unpushed commits only")
-        run_git("branch", branch_name, cwd=source_worktree_path)
-        run_git("worktree", "add", str(worktree_path), branch_name)
+        # Branch at the source worktree's HEAD and check it out in one call
+        add_args = ["worktree", "add", "-b", branch_name, str(worktree_path), "HEAD"]
+        add_cwd = source_worktree_path
 
     elif include_changes_choice in ("uncommitted", "all"):
         print_info(f"  Including: {include_changes_choice} changes")
@@ -745,75 +1182,102 @@ def main() -> int:
             and "No local changes" not in stash_result.stdout
         )
 
-        run_git("branch", branch_name, cwd=source_worktree_path)
-        run_git("worktree", "add", str(worktree_path), branch_name)
-
-        if stashed:
-            print_info("  Applying uncommitted changes...")
-            apply_result = run_git(
-                "stash", "apply", "stash@{0}", cwd=worktree_path, check=False
-            )
-            if apply_result.returncode != 0:
-                print_warning(f"Failed to apply stashed changes: {apply_result.stderr}")
-                print_warning("Changes remain stashed in source worktree")
-            else:
-                run_git("stash", "drop", "stash@{0}", cwd=source_worktree_path, check=False)
+        add_args = ["worktree", "add", "-b", branch_name, str(worktree_path), "HEAD"]
+        add_cwd = source_worktree_path
     else:
-        run_git(
-            "worktree", "add", str(worktree_path),
-            "-b", branch_name, args.source_branch
-        )
-
-    # Create symlinks
-    print()
-    created_symlinks = []
+        add_args = ["worktree", "add", str(worktree_path), "-b", branch_name, args.source_branch]
+
+    # The checkout takes a while; validate the .shared/ symlink targets
+    # (which don't depend on the new worktree) while git does it
+    adding = subprocess.Popen(
+        ["git", *add_args],
+        cwd=add_cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        close_fds=False,
+    )
     try:
-        created_symlinks = create_symlinks(worktree_path)
+        valid_specs = validate_symlink_targets(worktree_path)
     except SystemExit:
-        print_error("Symlink creation failed, cleaning up...")
-        try:
-            run_git("worktree", "remove", str(worktree_path), "--force")
-            print_info("Worktree removed")
-        except Exception:
-            print_warning(f"Please manually remove: git worktree remove {worktree_path}")
+        # A required target is missing: undo the worktree and hand any
+        # stashed changes back to the source worktree
+        adding.communicate()
+        if adding.returncode == 0:
+            run_git_quiet("worktree", "remove", str(worktree_path), "--force")
+            run_git_quiet("branch", "-D", branch_name)
+        if stashed:
+            run_git_quiet("stash", "pop", "stash@{0}", cwd=source_worktree_path)
         raise
+    add_stderr = adding.communicate()[1]
+    if adding.returncode != 0:
+        if stashed:
+            run_git_quiet("stash", "pop", "stash@{0}", cwd=source_worktree_path)
+        exit_with_error(f"Git command failed: {add_stderr.strip()}")
+
+    if stashed:
+        print_info("  Applying uncommitted changes...")
+        # The stash list is shared by all worktrees, so pop applies it
+        # here and drops it in one step (and keeps it if applying fails)
+        pop_result = run_git(
+            "stash", "pop", "stash@{0}", cwd=worktree_path, check=False
+        )
+        if pop_result.returncode != 0:
+            print_warning(f"Failed to apply stashed changes: {pop_result.stderr}")
+            print_warning("Changes remain stashed in source worktree")
 
-    # Setup direnv (auto-allow .envrc if direnv is installed)
-    setup_direnv(worktree_path)
+    # Create symlinks
+    print()
+    created_symlinks = create_symlinks_or_remove(worktree_path, branch_name, valid_specs)
+
+    # Setup direnv (auto-allow .envrc if direnv is installed) in the
+    # background while the venv is built; the two don't depend on each
+    # other. Its messages are buffered and shown once it's done.
+    direnv_out = io.StringIO()
+    from concurrent.futures import ThreadPoolExecutor  # Deferred; see create_worktree_batch
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        direnv_future = executor.submit(setup_direnv, worktree_path, direnv_out)
+
+        # Setup Python venv
+        if not args.no_venv:
+            print()
+            try:
+                setup_python_venv(worktree_path)
+            except VENV_SETUP_ERRORS as e:
+                print_warning(f"Venv setup failed: {e}")
+                print_warning("You can set up the environment manually later")
 
-    # Setup Python venv
-    if not args.no_venv:
-        print()
         try:
-            setup_python_venv(worktree_path)
-        except RuntimeError as e:
-            print_warning(f"Venv setup failed: {e}")
-            print_warning("You can set up the environment manually later")
-
-    # Print success summary
-    print()
-    print_success("=" * 60)
-    print_success("Worktree created successfully!")
-    print_success("=" * 60)
-    print()
-    print_info("Worktree details:")
-    print(f"  Location:     {worktree_path}")
-    print(f"  Branch:       {branch_name}")
-    print(f"  Source:       {args.source_branch}")
-    print()
-    print_info("Symlinks created:")
-    for spec in created_symlinks:
-        print(f"  [ok] {spec.link_name} -> {spec.target}")
-    print()
-    print_info("Next steps:")
-    print(f"  cd {worktree_path}")
-    if not args.no_venv:
-        print("  source .venv/bin/activate")
-    print("  # Start development")
-    print()
-    print_info("To view all worktrees:")
-    print("  git worktree list")
-    print()
+            direnv_future.result()
+        finally:
+            sys.stdout.write(direnv_out.getvalue())
+
+    # Print success summary (assembled first, then written in one go)
+    green, blue, nc = Colors.GREEN, Colors.BLUE, Colors.NC
+    summary = [
+        "",
+        f"{green}{'=' * 60}{nc}",
+        f"{green}Worktree created successfully!{nc}",
+        f"{green}{'=' * 60}{nc}",
+        "",
+        f"{blue}Worktree details:{nc}",
+        f"  Location:     {worktree_path}",
+        f"  Branch:       {branch_name}",
+        f"  Source:       {args.source_branch}",
+        "",
+        f"{blue}Symlinks created:{nc}",
+        *(f"  [ok] {spec.link_name} -> {spec.target}" for spec in created_symlinks),
+        "",
+        f"{blue}Next steps:{nc}",
+        f"  cd {worktree_path}",
+        *([] if args.no_venv else ["  source .venv/bin/activate"]),
+        "  # Start development",
+        "",
+        f"{blue}To view all worktrees:{nc}",
+        "  git worktree list",
+        "",
+    ]
+    sys.stdout.write("\n".join(summary) + "\n")
 
     return 0
 